@@ -7,6 +7,10 @@
 # 🌐 API Patterns: ~/rules/api-patterns.md
 # 💻 Coding Standards: ~/rules/coding-standards.md 
 import os
+import mmap
+import atexit
+import struct
+import threading
 import configparser
 import logging
 from datetime import datetime
@@ -30,6 +34,8 @@ def should_simulate():
 # Conditional GPIO import
 SIMULATION_MODE = should_simulate()
 
+_DEBUG = False  # Set True to echo every mock pin setup/write to stdout
+
 if SIMULATION_MODE:
     print("Core GPIO: Simulation mode enabled - using mock GPIO")
     # Create a mock GPIO module for simulation
@@ -48,13 +54,15 @@ if SIMULATION_MODE:
         def setwarnings(self, warnings):
             print(f"Mock GPIO: Set warnings to {warnings}")
             
-        def setup(self, pin, mode):
-            print(f"Mock GPIO: Setup pin {pin} as {mode}")
-            self.pin_states[pin] = False  # Initialize as OFF
+        def setup(self, pin, mode, initial=False):
+            if _DEBUG:
+                print(f"Mock GPIO: Setup pin {pin} as {mode}")
+            self.pin_states[pin] = initial  # Level the pin starts at, as RPi.GPIO's initial=
             
         def output(self, pin, state):
             self.pin_states[pin] = state
-            print(f"Mock GPIO: Pin {pin} set to {state}")
+            if _DEBUG:
+                print(f"Mock GPIO: Pin {pin} set to {state}")
             
         def input(self, pin):
             return self.pin_states.get(pin, False)
@@ -64,9 +72,11 @@ if SIMULATION_MODE:
             self.pin_states.clear()
     
     GPIO = MockGPIO()
+    _HARDWARE_GPIO = False
 else:
     try:
         import RPi.GPIO as GPIO
+        _HARDWARE_GPIO = True
         print("Core GPIO: Using real GPIO hardware")
     except ImportError:
         print("Core GPIO: RPi.GPIO not available - falling back to mock GPIO")
@@ -86,13 +96,15 @@ else:
             def setwarnings(self, warnings):
                 print(f"Mock GPIO: Set warnings to {warnings}")
                 
-            def setup(self, pin, mode):
-                print(f"Mock GPIO: Setup pin {pin} as {mode}")
-                self.pin_states[pin] = False  # Initialize as OFF
+            def setup(self, pin, mode, initial=False):
+                if _DEBUG:
+                    print(f"Mock GPIO: Setup pin {pin} as {mode}")
+                self.pin_states[pin] = initial  # Level the pin starts at, as RPi.GPIO's initial=
                 
             def output(self, pin, state):
                 self.pin_states[pin] = state
-                print(f"Mock GPIO: Pin {pin} set to {state}")
+                if _DEBUG:
+                    print(f"Mock GPIO: Pin {pin} set to {state}")
                 
             def input(self, pin):
                 return self.pin_states.get(pin, False)
@@ -102,28 +114,69 @@ else:
                 self.pin_states.clear()
         
         GPIO = MockGPIO()
+        _HARDWARE_GPIO = False
 
 # Setup loggers using unified system
 gpio_logger = setup_logger('gpio', 'gpio.log')
 system_logger = setup_logger('system', 'system.log')
+logger = gpio_logger  # Module-level alias used by the cleanup/debug helpers
 
 # Read config/gpio.cfg
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'gpio.cfg')
-config = configparser.ConfigParser()
-config.read(CONFIG_PATH)
+
+# Same truth table as configparser.getboolean
+_BOOLEAN_STATES = {'1': True, 'yes': True, 'true': True, 'on': True,
+                   '0': False, 'no': False, 'false': False, 'off': False}
+
+def read_gpio_config(path):
+    """
+    Read the [GPIO] section of gpio.cfg into a dict keyed by lowercase option name.
+    The file is a single flat section, so a line scan replaces configparser here.
+    """
+    values = {}
+    section = None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in '#;':
+                    continue
+                if line[0] == '[' and line[-1] == ']':
+                    section = line[1:-1].strip()
+                    continue
+                if section == 'GPIO':
+                    key, sep, value = line.partition('=')
+                    if sep:
+                        values[key.strip().lower()] = value.strip()
+    except OSError:
+        pass
+    return values
 
 def parse_pins(pin_str):
     return [int(p.strip()) for p in pin_str.split(',') if p.strip()]
 
+config = read_gpio_config(CONFIG_PATH)
+
 # Defaults
-ZONE_COUNT = int(config.get('GPIO', 'zoneCount', fallback='8'))
-PINS = parse_pins(config.get('GPIO', 'pins', fallback='5,6,13,16,19,20,21,26'))
-PUMP_INDEX = int(config.get('GPIO', 'pumpIndex', fallback='0'))
-ACTIVE_LOW = config.getboolean('GPIO', 'activeLow', fallback=True)
-MODE = config.get('GPIO', 'mode', fallback='BCM').upper()
+ZONE_COUNT = int(config.get('zonecount', '8'))
+PINS = parse_pins(config.get('pins', '5,6,13,16,19,20,21,26'))
+PUMP_INDEX = int(config.get('pumpindex', '0'))
+ACTIVE_LOW = _BOOLEAN_STATES.get(config.get('activelow', 'true').lower(), True)
+MODE = config.get('mode', 'BCM').upper()
+
+_ON = GPIO.LOW if ACTIVE_LOW else GPIO.HIGH  # Pin level that means a zone is ON
+_OFF = GPIO.HIGH if ACTIVE_LOW else GPIO.LOW  # Pin level that means a zone is OFF
 
 ZONE_PINS = {i+1: pin for i, pin in enumerate(PINS)}
 
+# Immutable views of the mapping for validation/log messages (built once, not per call)
+_VALID_ZONE_IDS = tuple(ZONE_PINS)
+_ALL_PINS = tuple(ZONE_PINS.values())
+_ALL_PINS_MASK = sum(1 << pin for pin in _ALL_PINS)  # Register bits for every zone pin
+
+# Register bit for each zone, used to build on/off masks for apply_zone_mask()
+PIN_MASK = {zone_id: 1 << pin for zone_id, pin in ZONE_PINS.items()}
+
 # Log configuration using unified logging
 log_event(gpio_logger, 'INFO', 'GPIO configuration loaded',
          zone_count=ZONE_COUNT,
@@ -135,6 +188,141 @@ log_event(gpio_logger, 'INFO', 'GPIO configuration loaded',
 
 _initialized = False
 _active_zones = set()  # Track which zones are currently active
+_active_zones_version = 0  # Bumped on every change to _active_zones
+_non_pump_active_count = 0  # Active zones other than the pump - decides when the pump can go off
+_active_sorted_cache = (0, [])  # (version, sorted list) reused by log/status calls
+_active_zones_lock = threading.Lock()  # Keeps _active_zones and its counters consistent across threads
+
+def _track_zone(zone_id, active):
+    """Add or remove a zone from the active set and invalidate the sorted view"""
+    global _active_zones_version, _non_pump_active_count
+    with _active_zones_lock:
+        if active != (zone_id in _active_zones) and zone_id != PUMP_INDEX:
+            _non_pump_active_count += 1 if active else -1
+        if active:
+            _active_zones.add(zone_id)
+        else:
+            _active_zones.discard(zone_id)
+        _active_zones_version += 1
+
+def _clear_tracked_zones():
+    """Forget all active zones and invalidate the sorted view"""
+    global _active_zones_version, _non_pump_active_count
+    with _active_zones_lock:
+        _active_zones.clear()
+        _non_pump_active_count = 0
+        _active_zones_version += 1
+
+def _sorted_active_zones():
+    """Sorted list of active zones, only re-sorted after the set changes (treat as read-only)"""
+    global _active_sorted_cache
+    version, cached = _active_sorted_cache
+    if version != _active_zones_version:
+        cached = sorted(_active_zones)
+        _active_sorted_cache = (_active_zones_version, cached)
+    return cached
+
+# BCM GPIO register block (real hardware, BCM numbering only)
+# Lets all pin levels be read with a single 32-bit load instead of one GPIO.input() per pin
+GPIOMEM_PATH = '/dev/gpiomem'
+_GPSET0 = 0x1C  # Write 1s to drive GPIO 0-31 high
+_GPCLR0 = 0x28  # Write 1s to drive GPIO 0-31 low
+_GPLEV0 = 0x34  # Pin level register for GPIO 0-31
+_gpiomem = None
+_gpiomem_checked = False
+
+def _open_gpiomem():
+    """Map the GPIO register block once; leaves _gpiomem as None if unavailable"""
+    global _gpiomem, _gpiomem_checked
+    if _gpiomem_checked:
+        return
+    _gpiomem_checked = True
+    
+    if not _HARDWARE_GPIO or MODE != 'BCM':
+        return
+    
+    try:
+        fd = os.open(GPIOMEM_PATH, os.O_RDWR | os.O_SYNC)
+        try:
+            _gpiomem = mmap.mmap(fd, 4096, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        finally:
+            os.close(fd)
+        log_event(gpio_logger, 'INFO', 'GPIO register block mapped', path=GPIOMEM_PATH)
+    except (OSError, ValueError) as e:
+        _gpiomem = None
+        log_event(gpio_logger, 'WARNING', 'GPIO register block unavailable - using per-pin reads', 
+                 path=GPIOMEM_PATH, error=str(e))
+
+# XOR with GPLEV0 so a set bit means the zone is ON, whatever the relay polarity
+_ON_LEVEL_FLIP = _ALL_PINS_MASK if ACTIVE_LOW else 0
+
+# Register that drives a pin to its ON / OFF level (active-low relays switch on when cleared)
+_ON_REG = _GPCLR0 if ACTIVE_LOW else _GPSET0
+_OFF_REG = _GPSET0 if ACTIVE_LOW else _GPCLR0
+_PIN_BITS = tuple((pin, 1 << pin) for pin in _ALL_PINS)
+
+def apply_zone_mask(on_mask, off_mask):
+    """Switch zones on/off in one write; masks are ORed PIN_MASK values"""
+    if _gpiomem is not None:
+        if on_mask:
+            struct.pack_into('<I', _gpiomem, _ON_REG, on_mask)
+        if off_mask:
+            struct.pack_into('<I', _gpiomem, _OFF_REG, off_mask)
+        return
+    
+    for pin, bit in _PIN_BITS:
+        if on_mask & bit:
+            GPIO.output(pin, _ON)
+        elif off_mask & bit:
+            GPIO.output(pin, _OFF)
+
+def _all_zones_off():
+    """Drive every zone pin to its OFF level - a single register write when mapped"""
+    apply_zone_mask(0, _ALL_PINS_MASK)
+
+def _read_levels():
+    """Return the GPLEV0 bit vector, or None when the register block is not mapped"""
+    if _gpiomem is None:
+        return None
+    return struct.unpack_from('<I', _gpiomem, _GPLEV0)[0]
+
+# Sysfs value files (exported pins only) - kept open so a state poll is seek + 1-byte read
+SYSFS_GPIO_PATH = '/sys/class/gpio'
+_value_fds = {}  # zone_id -> unbuffered binary handle on gpioN/value
+
+def _open_value_fds():
+    """Open persistent value handles when every zone pin is exported via sysfs"""
+    if not _HARDWARE_GPIO or MODE != 'BCM' or _value_fds:
+        return
+    
+    paths = {zone_id: os.path.join(SYSFS_GPIO_PATH, f'gpio{pin}', 'value') 
+             for zone_id, pin in ZONE_PINS.items()}
+    if not all(os.path.exists(path) for path in paths.values()):
+        return
+    
+    try:
+        for zone_id, path in paths.items():
+            _value_fds[zone_id] = open(path, 'rb', buffering=0)
+    except OSError as e:
+        _close_value_fds()
+        log_event(gpio_logger, 'WARNING', 'Sysfs value files unavailable - using GPIO.input', 
+                 path=SYSFS_GPIO_PATH, error=str(e))
+
+def _close_value_fds():
+    """Close any sysfs value handles opened by setup_gpio()"""
+    for fd in _value_fds.values():
+        try:
+            fd.close()
+        except OSError:
+            pass
+    _value_fds.clear()
+
+atexit.register(_close_value_fds)
+
+def _read_value_fd(fd):
+    """Return True if the pin behind a sysfs value handle is at its ON level"""
+    fd.seek(0)
+    return bool(fd.read(1)[0] - 48) != ACTIVE_LOW
 
 def setup_gpio():
     global _initialized
@@ -150,133 +338,204 @@ def setup_gpio():
         else:
             raise ValueError(f"Unknown GPIO mode: {MODE}")
         
-        for zone_id, pin in ZONE_PINS.items():
-            GPIO.setup(pin, GPIO.OUT)
-            # Ensure all are off at start
-            initial_state = GPIO.LOW if not ACTIVE_LOW else GPIO.HIGH
-            GPIO.output(pin, initial_state)
+        # Ensure all are off at start - the OFF level is in place before any pin becomes an output
+        _open_gpiomem()
+        if _gpiomem is not None:
+            # One masked write latches OFF on every zone pin, then only the direction changes
+            _all_zones_off()
+            for pin in _ALL_PINS:
+                GPIO.setup(pin, GPIO.OUT)
+        else:
+            for pin in _ALL_PINS:
+                GPIO.setup(pin, GPIO.OUT, initial=_OFF)
+        _open_value_fds()
         
         _initialized = True
         log_event(gpio_logger, 'INFO', 'GPIO initialization completed', 
                  zone_count=len(ZONE_PINS),
-                 pins=list(ZONE_PINS.values()),
+                 pins=_ALL_PINS,
                  mode=MODE)
     except Exception as e:
         log_event(gpio_logger, 'ERROR', 'GPIO initialization failed', error=str(e))
         raise
 
+# Toggle-path log messages in log_event's "message | key=value" layout, pre-built so each
+# call passes positional args and logging formats them lazily (no per-call kwargs dict/join)
+_LOG_ZONE_ACTIVATED = 'Zone activated | zone_id=%s pin=%s previous_state=%s active_zones=%s'
+_LOG_PUMP_ACTIVATED = 'Pump activated for zone | zone_id=%s pump_zone=%s pump_pin=%s'
+_LOG_PUMP_DIRECT = 'Pump zone activated directly | zone_id=%s'
+_LOG_ZONE_DEACTIVATED = 'Zone deactivated | zone_id=%s pin=%s previous_state=%s was_tracked=%s active_zones=%s'
+_LOG_PUMP_DEACTIVATED = 'Pump deactivated - no zones active | pump_zone=%s pump_pin=%s'
+_LOG_PUMP_KEPT = 'Pump kept active - other zones running | pump_zone=%s other_active_zones=%s'
+
 def activate_zone(zone_id):
-    setup_gpio()
+    if not _initialized:
+        setup_gpio()
     
-    if zone_id not in ZONE_PINS:
+    # Single lookup doubles as the validity check
+    pin = ZONE_PINS.get(zone_id)
+    if pin is None:
         log_event(gpio_logger, 'WARNING', 'Zone activation failed - invalid zone', 
                  zone_id=zone_id, 
-                 valid_zones=list(ZONE_PINS.keys()))
+                 valid_zones=_VALID_ZONE_IDS)
         return
     
-    pin = ZONE_PINS[zone_id]
-    
-    # Check current state before activation
-    try:
-        current_state = GPIO.input(pin)
-        current_on = (current_state == GPIO.LOW) == ACTIVE_LOW
-    except Exception as e:
-        log_event(gpio_logger, 'WARNING', 'Could not read current zone state', 
-                 zone_id=zone_id, pin=pin, error=str(e))
-        current_on = False
+    # Previous state comes from our own tracking - no hardware readback on the toggle path
+    current_on = zone_id in _active_zones
     
-    # For activeLow, ON = LOW; for activeHigh, ON = HIGH
-    target_state = GPIO.LOW if ACTIVE_LOW else GPIO.HIGH
-    GPIO.output(pin, target_state)
+    # Zone and (if configured) pump switch on together in a single write
+    pump_on = PUMP_INDEX > 0 and zone_id != PUMP_INDEX and PUMP_INDEX in ZONE_PINS
+    on_mask = PIN_MASK[zone_id]
+    if pump_on:
+        on_mask |= PIN_MASK[PUMP_INDEX]
+    apply_zone_mask(on_mask, 0)
     
     # Track active zone
-    _active_zones.add(zone_id)
+    _track_zone(zone_id, True)
     
     # Log activation with structured data
-    log_event(gpio_logger, 'INFO', 'Zone activated', 
-             zone_id=zone_id, 
-             pin=pin,
-             previous_state='ON' if current_on else 'OFF',
-             active_zones=sorted(_active_zones))
-    
-    # If pump is configured and this isn't the pump zone itself, activate pump
-    if PUMP_INDEX > 0 and zone_id != PUMP_INDEX and PUMP_INDEX in ZONE_PINS:
-        pump_pin = ZONE_PINS[PUMP_INDEX]
-        GPIO.output(pump_pin, GPIO.LOW if ACTIVE_LOW else GPIO.HIGH)
-        log_event(gpio_logger, 'INFO', 'Pump activated for zone', 
-                 zone_id=zone_id, 
-                 pump_zone=PUMP_INDEX, 
-                 pump_pin=pump_pin)
+    gpio_logger.info(_LOG_ZONE_ACTIVATED, zone_id, pin, 
+                     'ON' if current_on else 'OFF', _sorted_active_zones())
+    
+    # If pump is configured and this isn't the pump zone itself, the pump came on with it
+    if pump_on:
+        gpio_logger.info(_LOG_PUMP_ACTIVATED, zone_id, PUMP_INDEX, ZONE_PINS[PUMP_INDEX])
     elif zone_id == PUMP_INDEX:
-        log_event(gpio_logger, 'INFO', 'Pump zone activated directly', zone_id=zone_id)
+        gpio_logger.info(_LOG_PUMP_DIRECT, zone_id)
 
 def deactivate_zone(zone_id):
-    setup_gpio()
+    if not _initialized:
+        setup_gpio()
     
-    if zone_id not in ZONE_PINS:
+    pin = ZONE_PINS.get(zone_id)
+    if pin is None:
         log_event(gpio_logger, 'WARNING', 'Zone deactivation failed - invalid zone', 
                  zone_id=zone_id, 
-                 valid_zones=list(ZONE_PINS.keys()))
+                 valid_zones=_VALID_ZONE_IDS)
         return
-        
-    pin = ZONE_PINS[zone_id]
-    
-    # Check current state before deactivation
-    try:
-        current_state = GPIO.input(pin)
-        current_on = (current_state == GPIO.LOW) == ACTIVE_LOW
-    except Exception as e:
-        log_event(gpio_logger, 'WARNING', 'Could not read current zone state', 
-                 zone_id=zone_id, pin=pin, error=str(e))
-        current_on = False
-    
-    # For activeLow, OFF = HIGH; for activeHigh, OFF = LOW
-    target_state = GPIO.HIGH if ACTIVE_LOW else GPIO.LOW
-    GPIO.output(pin, target_state)
     
     # Remove from active zones BEFORE checking pump status
+    # Previous state comes from our own tracking - no hardware readback on the toggle path
     was_in_active = zone_id in _active_zones
-    _active_zones.discard(zone_id)
+    current_on = was_in_active
+    _track_zone(zone_id, False)
+    
+    # If pump is configured and no non-pump zones remain active, it goes off in the same write
+    pump_configured = PUMP_INDEX > 0 and PUMP_INDEX in ZONE_PINS
+    pump_off = pump_configured and _non_pump_active_count == 0
+    off_mask = PIN_MASK[zone_id]
+    if pump_off:
+        off_mask |= PIN_MASK[PUMP_INDEX]
+    apply_zone_mask(0, off_mask)
     
     # Log deactivation with structured data
-    log_event(gpio_logger, 'INFO', 'Zone deactivated', 
-             zone_id=zone_id, 
-             pin=pin,
-             previous_state='ON' if current_on else 'OFF',
-             was_tracked=was_in_active,
-             active_zones=sorted(_active_zones))
-    
-    # If pump is configured and no other zones are active, deactivate pump
-    if PUMP_INDEX > 0 and PUMP_INDEX in ZONE_PINS:
-        # Check if any non-pump zones are still active
-        other_active = _active_zones - {PUMP_INDEX}
-        
-        if not other_active:
-            pump_pin = ZONE_PINS[PUMP_INDEX]
-            GPIO.output(pump_pin, GPIO.HIGH if ACTIVE_LOW else GPIO.LOW)
-            log_event(gpio_logger, 'INFO', 'Pump deactivated - no zones active', 
-                     pump_zone=PUMP_INDEX, 
-                     pump_pin=pump_pin)
+    gpio_logger.info(_LOG_ZONE_DEACTIVATED, zone_id, pin, 
+                     'ON' if current_on else 'OFF', was_in_active, _sorted_active_zones())
+    
+    if pump_configured:
+        if pump_off:
+            gpio_logger.info(_LOG_PUMP_DEACTIVATED, PUMP_INDEX, ZONE_PINS[PUMP_INDEX])
         else:
-            log_event(gpio_logger, 'INFO', 'Pump kept active - other zones running', 
-                     pump_zone=PUMP_INDEX,
-                     other_active_zones=sorted(other_active))
+            gpio_logger.info(_LOG_PUMP_KEPT, PUMP_INDEX, 
+                             [z for z in _sorted_active_zones() if z != PUMP_INDEX])
+
+def activate_zones(zone_ids):
+    """Switch several zones on (plus the pump, if configured) with a single write"""
+    if not _initialized:
+        setup_gpio()
+    
+    valid_ids = []
+    for zone_id in zone_ids:
+        if zone_id in ZONE_PINS:
+            valid_ids.append(zone_id)
+        else:
+            log_event(gpio_logger, 'WARNING', 'Zone activation failed - invalid zone', 
+                     zone_id=zone_id, 
+                     valid_zones=_VALID_ZONE_IDS)
+    if not valid_ids:
+        return
+    
+    on_mask = 0
+    for zone_id in valid_ids:
+        on_mask |= PIN_MASK[zone_id]
+    pump_on = (PUMP_INDEX > 0 and PUMP_INDEX in ZONE_PINS 
+               and any(zone_id != PUMP_INDEX for zone_id in valid_ids))
+    if pump_on:
+        on_mask |= PIN_MASK[PUMP_INDEX]
+    apply_zone_mask(on_mask, 0)
+    
+    for zone_id in valid_ids:
+        current_on = zone_id in _active_zones
+        _track_zone(zone_id, True)
+        gpio_logger.info(_LOG_ZONE_ACTIVATED, zone_id, ZONE_PINS[zone_id], 
+                         'ON' if current_on else 'OFF', _sorted_active_zones())
+    
+    if pump_on:
+        log_event(gpio_logger, 'INFO', 'Pump activated for zones', 
+                 zone_ids=valid_ids, 
+                 pump_zone=PUMP_INDEX, 
+                 pump_pin=ZONE_PINS[PUMP_INDEX])
+
+def deactivate_zones(zone_ids):
+    """Switch several zones off (plus the pump, if nothing else needs it) with a single write"""
+    if not _initialized:
+        setup_gpio()
+    
+    valid_ids = []
+    for zone_id in zone_ids:
+        if zone_id in ZONE_PINS:
+            valid_ids.append(zone_id)
+        else:
+            log_event(gpio_logger, 'WARNING', 'Zone deactivation failed - invalid zone', 
+                     zone_id=zone_id, 
+                     valid_zones=_VALID_ZONE_IDS)
+    if not valid_ids:
+        return
+    
+    off_mask = 0
+    for zone_id in valid_ids:
+        off_mask |= PIN_MASK[zone_id]
+    # Pump goes off in the same write if this batch turns off every active non-pump zone
+    # (decided before tracking, so the counter still reflects the hardware state)
+    pump_configured = PUMP_INDEX > 0 and PUMP_INDEX in ZONE_PINS
+    switching_off = {zone_id for zone_id in valid_ids if zone_id != PUMP_INDEX and zone_id in _active_zones}
+    pump_off = pump_configured and _non_pump_active_count == len(switching_off)
+    if pump_off:
+        off_mask |= PIN_MASK[PUMP_INDEX]
+    apply_zone_mask(0, off_mask)
+    
+    for zone_id in valid_ids:
+        was_in_active = zone_id in _active_zones
+        _track_zone(zone_id, False)
+        gpio_logger.info(_LOG_ZONE_DEACTIVATED, zone_id, ZONE_PINS[zone_id], 
+                         'ON' if was_in_active else 'OFF', was_in_active, _sorted_active_zones())
+    
+    if pump_configured:
+        if pump_off:
+            gpio_logger.info(_LOG_PUMP_DEACTIVATED, PUMP_INDEX, ZONE_PINS[PUMP_INDEX])
+        else:
+            gpio_logger.info(_LOG_PUMP_KEPT, PUMP_INDEX, 
+                             [z for z in _sorted_active_zones() if z != PUMP_INDEX])
 
 def get_zone_state(zone_id):
     """Get the current hardware state of a zone"""
-    setup_gpio()
-    if zone_id not in ZONE_PINS:
+    if not _initialized:
+        setup_gpio()
+    pin = ZONE_PINS.get(zone_id)
+    if pin is None:
         log_event(gpio_logger, 'WARNING', 'Zone state check failed - invalid zone', 
                  zone_id=zone_id, 
-                 valid_zones=list(ZONE_PINS.keys()))
+                 valid_zones=_VALID_ZONE_IDS)
         return False
     
-    pin = ZONE_PINS[zone_id]
     try:
+        fd = _value_fds.get(zone_id)
+        if fd is not None:
+            return _read_value_fd(fd)
         state = GPIO.input(pin)
         # For active low: LOW = ON (True), HIGH = OFF (False)
         # For active high: HIGH = ON (True), LOW = OFF (False)
-        is_on = (state == GPIO.LOW) if ACTIVE_LOW else (state == GPIO.HIGH)
+        is_on = (state == _ON)
         return is_on
     except Exception as e:
         log_event(gpio_logger, 'ERROR', 'Error reading zone state', 
@@ -285,9 +544,20 @@ def get_zone_state(zone_id):
 
 def get_all_zone_states():
     """Get the current hardware state of all zones"""
-    states = {}
-    for zone_id in ZONE_PINS.keys():
-        states[zone_id] = get_zone_state(zone_id)
+    if not _initialized:
+        setup_gpio()
+    
+    levels = _read_levels()
+    if levels is not None:
+        # One register snapshot covers every zone; flip it once so a set bit means ON
+        on_levels = levels ^ _ON_LEVEL_FLIP
+        states = {zone_id: bool(on_levels & bit) for zone_id, bit in PIN_MASK.items()}
+    elif len(_value_fds) == len(ZONE_PINS):
+        states = {zone_id: _read_value_fd(fd) for zone_id, fd in _value_fds.items()}
+    else:
+        states = {}
+        for zone_id in ZONE_PINS.keys():
+            states[zone_id] = get_zone_state(zone_id)
     
     active_zones = [zone_id for zone_id, is_on in states.items() if is_on]
     
@@ -309,14 +579,17 @@ def cleanup_gpio():
         return
     
     try:
-        logger.info(f"Active zones before cleanup: {sorted(_active_zones)}")
+        logger.info(f"Active zones before cleanup: {_sorted_active_zones()}")
         
-        # Turn off all zones before cleanup
+        # Turn off all zones (pump included) before cleanup
         logger.info("Deactivating all zones before cleanup")
-        for zone_id in ZONE_PINS.keys():
-            logger.info(f"Deactivating zone {zone_id} during cleanup")
-            deactivate_zone(zone_id)
+        _all_zones_off()
+        _clear_tracked_zones()
+        log_event(gpio_logger, 'INFO', 'All zones deactivated for cleanup', 
+                 pins=_ALL_PINS, 
+                 single_write=_gpiomem is not None)
         
+        _close_value_fds()
         logger.info("Calling GPIO.cleanup()")
         GPIO.cleanup()
         logger.info("GPIO cleanup completed successfully")
@@ -326,20 +599,20 @@ def cleanup_gpio():
         raise
     finally:
         _initialized = False
-        _active_zones.clear()
+        _clear_tracked_zones()
         logger.info("GPIO state reset: _initialized=False, _active_zones cleared")
         logger.info("=== GPIO CLEANUP COMPLETED ===")
 
 def get_active_zones():
     """Get the set of currently active zones (for debugging)"""
-    logger.debug(f"Active zones query: {sorted(_active_zones)}")
+    logger.debug(f"Active zones query: {_sorted_active_zones()}")
     return _active_zones.copy()
 
 def log_gpio_status():
     """Log comprehensive GPIO status for debugging"""
     logger.info("=== GPIO STATUS REPORT ===")
     logger.info(f"Initialized: {_initialized}")
-    logger.info(f"Active zones: {sorted(_active_zones)}")
+    logger.info(f"Active zones: {_sorted_active_zones()}")
     logger.info(f"Zone pin mapping: {ZONE_PINS}")
     logger.info(f"Pump index: {PUMP_INDEX}")
     logger.info(f"Active low: {ACTIVE_LOW}")
@@ -347,10 +620,11 @@ def log_gpio_status():
     
     if _initialized:
         logger.info("Hardware states:")
+        levels = _read_levels()  # One snapshot for all zones when the register block is mapped
         for zone_id, pin in ZONE_PINS.items():
             try:
-                state = GPIO.input(pin)
-                is_on = (state == GPIO.LOW) if ACTIVE_LOW else (state == GPIO.HIGH)
+                state = (levels >> pin) & 1 if levels is not None else GPIO.input(pin)
+                is_on = (state == _ON)
                 logger.info(f"  Zone {zone_id} (pin {pin}): {'ON' if is_on else 'OFF'} (raw: {state})")
             except Exception as e:
                 logger.error(f"  Zone {zone_id} (pin {pin}): Error reading state - {e}")
@@ -370,7 +644,7 @@ def test_gpio_direct(zone_id: int, duration_seconds: int = 2):
         
         # Check if zone exists
         if zone_id not in ZONE_PINS:
-            logger.error(f"Zone {zone_id} not in configured pins: {list(ZONE_PINS.keys())}")
+            logger.error(f"Zone {zone_id} not in configured pins: {_VALID_ZONE_IDS}")
             return False
         
         pin = ZONE_PINS[zone_id]
@@ -403,7 +677,7 @@ def get_gpio_status():
         setup_gpio()
         status = {
             'initialized': _initialized,
-            'active_zones': sorted(_active_zones),
+            'active_zones': list(_sorted_active_zones()),
             'zone_pins': ZONE_PINS,
             'pump_index': PUMP_INDEX,
             'active_low': ACTIVE_LOW,
@@ -411,11 +685,12 @@ def get_gpio_status():
             'hardware_states': {}
         }
         
-        # Get actual hardware states
+        # Get actual hardware states (one register snapshot for all zones when mapped)
+        levels = _read_levels()
         for zone_id, pin in ZONE_PINS.items():
             try:
-                state = GPIO.input(pin)
-                is_on = (state == GPIO.LOW) if ACTIVE_LOW else (state == GPIO.HIGH)
+                state = (levels >> pin) & 1 if levels is not None else GPIO.input(pin)
+                is_on = (state == _ON)
                 status['hardware_states'][zone_id] = {
                     'pin': pin,
                     'raw_state': state,
@@ -10,11 +10,54 @@ Handles reading and writing operations for plant library files.
 """
 
 import os
+import sys
 import json
-from typing import Dict, List, Optional, Any
-# Simplified logging for now - just use print statements
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+
+# orjson is optional - it decodes/encodes several times faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional - lets a cold single-plant lookup stop parsing once the plant is found
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to UTF-8 bytes with 2-space indent, same layout from either backend"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+# INFO-level library events (plant added/updated, library saved) go through this logger.
+# It prints to stdout at INFO by default, same as before; raise its level
+# (logging.getLogger('core.library').setLevel(logging.WARNING)) to silence them at runtime.
+library_logger = logging.getLogger(__name__)
+if not library_logger.handlers:
+    _stdout_handler = logging.StreamHandler(sys.stdout)
+    _stdout_handler.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+    library_logger.addHandler(_stdout_handler)
+    library_logger.setLevel(logging.INFO)
+    library_logger.propagate = False
+
+# Simplified logging for now - just use print statements (INFO goes through library_logger)
 def log_event(logger, level, message, **kwargs):
-    """Simple logging function"""
+    """Simple logging function - INFO events are skipped before formatting when library_logger has INFO disabled"""
+    if level == 'INFO':
+        if not kwargs:
+            library_logger.info('%s', message)
+        elif library_logger.isEnabledFor(logging.INFO):
+            library_logger.info('%s | %s', message, ' '.join([f"{k}={v}" for k, v in kwargs.items()]))
+        return
     if kwargs:
         context = ' '.join([f"{k}={v}" for k, v in kwargs.items()])
         message = f"{message} | {context}"
@@ -22,7 +65,7 @@ def log_event(logger, level, message, **kwargs):
 
 # Create simple logger objects
 class SimpleLogger:
-    def info(self, message): print(f"[INFO] {message}")
+    def info(self, message): library_logger.info('%s', message)
     def error(self, message): print(f"[ERROR] {message}")
     def warning(self, message): print(f"[WARN] {message}")
 
@@ -33,25 +76,78 @@ error_logger = SimpleLogger()
 LIBRARY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'library')
 CUSTOM_LIBRARY_PATH = os.path.join(LIBRARY_DIR, 'custom.json')
 
+# Uncached library files above this size are streamed by get_plant_from_library (needs ijson) -
+# on the first lookup only; the next lookup parses the file into _json_cache and uses the index
+STREAM_THRESHOLD_BYTES = 256 * 1024
+_streamed_paths = set()  # large files already streamed once
+
+# Parsed JSON keyed by path -> (mtime_ns, size, data); reused while the file is unchanged
+_json_cache: Dict[str, Tuple[int, int, Any]] = {}
+
 def load_json_file(file_path: str, default: Any = None) -> Any:
-    """Load a JSON file with error handling"""
+    """
+    Load a JSON file with error handling.
+    The parsed object is shared between callers while the file is unchanged - copy before mutating.
+    """
     try:
-        if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return default
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return default
+        
+        cached = _json_cache.get(file_path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        with open(file_path, 'rb') as f:
+            data = _json_loads(f.read())
+        _json_cache[file_path] = (st.st_mtime_ns, st.st_size, data)
+        return data
     except Exception as e:
         print(f"Error loading JSON file {file_path}: {e}")
         return default
 
+# Library index: file path -> (cached library object, {plant_id: position in 'plants'}).
+# Entries are rebuilt only when load_json_file() hands back a new object (file changed on disk)
+_library_index: Dict[str, Tuple[Any, Dict[Any, int]]] = {}
+
+def _plant_index(file_path: str, file_data: Dict[str, Any]) -> Dict[Any, int]:
+    """Return the plant_id index for file_data, rebuilding it only when the object changes"""
+    entry = _library_index.get(file_path)
+    if entry is not None and entry[0] is file_data:
+        return entry[1]
+    
+    index = {}
+    for i, plant in enumerate(file_data.get('plants', [])):
+        index.setdefault(plant.get('plant_id'), i)  # First match wins, as with a linear scan
+    _library_index[file_path] = (file_data, index)
+    return index
+
+# Directories already created by save_json_file, so later saves skip the makedirs call
+_dirs_made = set()
+
 def save_json_file(file_path: str, data: Any) -> bool:
-    """Save data to a JSON file with error handling"""
+    """Save data to a JSON file with error handling (atomic: temp file + rename)"""
     try:
         # Ensure directory exists
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        dir_path = os.path.dirname(file_path)
+        if dir_path not in _dirs_made:
+            os.makedirs(dir_path, exist_ok=True)
+            _dirs_made.add(dir_path)
+        
+        # Write a sibling temp file and swap it in, so a crash never leaves a half-written library
+        tmp_path = file_path + '.tmp'
+        payload = _json_dumps(data)
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Seed the cache with a parse of the bytes just written, never the caller's object -
+        # callers pass request bodies through, and later changes to those must not leak into the cache
+        st = os.stat(file_path)
+        _json_cache[file_path] = (st.st_mtime_ns, st.st_size, _json_loads(payload))
         return True
     except Exception as e:
         print(f"Error saving JSON file {file_path}: {e}")
@@ -59,7 +155,14 @@ def save_json_file(file_path: str, data: Any) -> bool:
 
 def get_next_plant_id(custom_data: Dict[str, Any]) -> int:
     """Find the next available plant_id in the custom library"""
-    existing_plant_ids = [plant.get('plant_id', 0) for plant in custom_data.get('plants', [])]
+    existing_plant_ids = {plant.get('plant_id', 0) for plant in custom_data.get('plants', [])}
+    # Common append case: ids are exactly 1..N, so N+1 is free without probing
+    # (only when every id is a positive int - {-1, 2} has max == len but 1 is free)
+    if all(isinstance(i, int) and i >= 1 for i in existing_plant_ids):
+        highest = max(existing_plant_ids, default=0)
+        if highest == len(existing_plant_ids):
+            return highest + 1
+    # Otherwise fill the lowest gap - one must exist within 1..len+1
     next_plant_id = 1
     while next_plant_id in existing_plant_ids:
         next_plant_id += 1
@@ -77,10 +180,7 @@ def add_plant_to_custom_library(plant_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         # Load existing custom library or create new one
-        custom_data = load_json_file(CUSTOM_LIBRARY_PATH, {
-            "Book Name": "Custom Plants",
-            "plants": []
-        })
+        custom_data = get_custom_library()
         
         # Find the next available plant_id
         next_plant_id = get_next_plant_id(custom_data)
@@ -113,13 +213,30 @@ def add_plant_to_custom_library(plant_data: Dict[str, Any]) -> Dict[str, Any]:
         log_event(error_logger, 'ERROR', f'Custom plant addition exception', error=str(e))
         return {'error': str(e)}
 
-def get_custom_library() -> Dict[str, Any]:
-    """Get the current custom library data"""
+def _load_custom_library() -> Dict[str, Any]:
+    """Shared (cached) custom library object - do not modify"""
     return load_json_file(CUSTOM_LIBRARY_PATH, {
         "Book Name": "Custom Plants",
         "plants": []
     })
 
+def _copy_library(file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy the top level and plants list so a cached library can be edited and saved"""
+    copied = dict(file_data)
+    copied['plants'] = list(file_data.get('plants', []))
+    return copied
+
+def get_custom_library(fresh: bool = False) -> Dict[str, Any]:
+    """
+    Get the current custom library data (top level and plants list copied, safe to modify)
+    
+    Args:
+        fresh: Re-read custom.json even if the cached parse still matches its mtime/size
+    """
+    if fresh:
+        _json_cache.pop(CUSTOM_LIBRARY_PATH, None)
+    return _copy_library(_load_custom_library())
+
 def update_custom_library(custom_data: Dict[str, Any]) -> bool:
     """Update the entire custom library"""
     return save_json_file(CUSTOM_LIBRARY_PATH, custom_data)
@@ -136,22 +253,19 @@ def update_plant_in_custom_library(plant_id: int, plant_data: Dict[str, Any]) ->
         Dict with status and message
     """
     try:
-        custom_data = get_custom_library()
-        
-        # Find and update the plant
-        plant_found = False
-        for i, plant in enumerate(custom_data['plants']):
-            if plant.get('plant_id') == plant_id:
-                # Update the plant data while preserving the plant_id
-                plant_data['plant_id'] = plant_id  # Ensure plant_id doesn't change
-                custom_data['plants'][i] = plant_data
-                plant_found = True
-                break
+        cached_data = _load_custom_library()
         
-        if not plant_found:
+        # Find the plant by id
+        i = _plant_index(CUSTOM_LIBRARY_PATH, cached_data).get(plant_id)
+        if i is None:
             log_event(user_logger, 'WARN', f'Custom plant update failed - plant not found', plant_id=plant_id)
             return {'error': 'Plant not found'}
         
+        # Update the plant data while preserving the plant_id
+        plant_data['plant_id'] = plant_id  # Ensure plant_id doesn't change
+        custom_data = _copy_library(cached_data)
+        custom_data['plants'][i] = plant_data
+        
         # Save the updated custom library
         if save_json_file(CUSTOM_LIBRARY_PATH, custom_data):
             log_event(user_logger, 'INFO', f'Custom plant updated', 
@@ -179,16 +293,14 @@ def delete_plant_from_custom_library(plant_id: int) -> Dict[str, Any]:
         Dict with status and message
     """
     try:
-        custom_data = get_custom_library()
+        cached_data = _load_custom_library()
         
         # Find and remove the plant
-        original_count = len(custom_data['plants'])
-        custom_data['plants'] = [
-            plant for plant in custom_data['plants'] 
-            if plant.get('plant_id') != plant_id
-        ]
+        i = _plant_index(CUSTOM_LIBRARY_PATH, cached_data).get(plant_id)
         
-        if len(custom_data['plants']) < original_count:
+        if i is not None:
+            custom_data = _copy_library(cached_data)
+            del custom_data['plants'][i]
             if save_json_file(CUSTOM_LIBRARY_PATH, custom_data):
                 log_event(user_logger, 'INFO', f'Custom plant deleted', plant_id=plant_id)
                 return {'status': 'success', 'message': f'Plant {plant_id} deleted'}
@@ -208,21 +320,32 @@ def get_library_files() -> List[Dict[str, Any]]:
     if not os.path.exists(LIBRARY_DIR):
         return files
     
-    for filename in os.listdir(LIBRARY_DIR):
-        if filename.endswith('.json') and os.path.isfile(os.path.join(LIBRARY_DIR, filename)):
+    with os.scandir(LIBRARY_DIR) as entries:
+        for entry in entries:
+            if not (entry.name.endswith('.json') and entry.is_file()):
+                continue
             try:
-                file_path = os.path.join(LIBRARY_DIR, filename)
-                file_data = load_json_file(file_path, {})
+                file_data = load_json_file(entry.path, {})
+                # Index while we have it, so get_plant_from_library() lookups are ready
+                _plant_index(entry.path, file_data)
                 files.append({
-                    'filename': filename,
+                    'filename': entry.name,
                     'plants': file_data.get('plants', [])
                 })
             except Exception as e:
-                print(f"Error loading library file {filename}: {e}")
+                print(f"Error loading library file {entry.name}: {e}")
                 continue
     
     return files
 
+def _stream_plant_from_file(file_path: str, plant_id: int) -> Optional[Dict[str, Any]]:
+    """Scan the plants array incrementally and stop at the first matching plant_id"""
+    with open(file_path, 'rb') as f:
+        for plant in ijson.items(f, 'plants.item', use_float=True):
+            if plant.get('plant_id') == plant_id:
+                return plant
+    return None
+
 def get_plant_from_library(filename: str, plant_id: int) -> Optional[Dict[str, Any]]:
     """
     Get a specific plant from a library file
@@ -236,13 +359,23 @@ def get_plant_from_library(filename: str, plant_id: int) -> Optional[Dict[str, A
     """
     try:
         file_path = os.path.join(LIBRARY_DIR, filename)
-        if not os.path.exists(file_path):
-            return None
         
-        file_data = load_json_file(file_path, {})
-        plants = file_data.get('plants', [])
+        # First lookup in a large, unparsed file - stream to the plant instead of materializing the
+        # whole library. A second lookup means the file is in use, so fall through and warm the cache
+        if ijson is not None and file_path not in _json_cache and file_path not in _streamed_paths:
+            try:
+                if os.stat(file_path).st_size > STREAM_THRESHOLD_BYTES:
+                    _streamed_paths.add(file_path)
+                    return _stream_plant_from_file(file_path, plant_id)
+            except FileNotFoundError:
+                return None
         
-        return next((p for p in plants if p.get('plant_id') == plant_id), None)
+        file_data = load_json_file(file_path)
+        if file_data is None:
+            return None
+        
+        i = _plant_index(file_path, file_data).get(plant_id)
+        return file_data['plants'][i] if i is not None else None
         
     except Exception as e:
         print(f"Error getting plant from library: {e}")
@@ -288,12 +421,17 @@ def get_library_file_paths() -> Dict[str, str]:
     if not os.path.exists(LIBRARY_DIR):
         return library_paths
     
-    for filename in os.listdir(LIBRARY_DIR):
-        if filename.endswith('.json') and os.path.isfile(os.path.join(LIBRARY_DIR, filename)):
-            library_paths[filename] = os.path.join(LIBRARY_DIR, filename)
+    with os.scandir(LIBRARY_DIR) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.is_file():
+                library_paths[entry.name] = entry.path
     
     return library_paths
 
+# Fields every library plant must carry; the tuple keeps error messages in a stable order
+_REQUIRED_FIELD_ORDER = ('plant_id', 'common_name', 'latin_name')
+REQUIRED_PLANT_FIELDS = frozenset(_REQUIRED_FIELD_ORDER)
+
 def validate_library_data(library_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate library data structure
@@ -314,15 +452,16 @@ def validate_library_data(library_data: Dict[str, Any]) -> Dict[str, Any]:
         if not isinstance(library_data['plants'], list):
             return {'valid': False, 'error': 'Plants must be an array'}
         
-        # Validate each plant
+        # Validate each plant - one set difference per plant, stop at the first problem
         for i, plant in enumerate(library_data['plants']):
-            if not isinstance(plant, dict):
+            try:
+                missing = REQUIRED_PLANT_FIELDS - plant.keys()
+            except AttributeError:
                 return {'valid': False, 'error': f'Plant at index {i} must be a dictionary'}
             
-            required_fields = ['plant_id', 'common_name', 'latin_name']
-            for field in required_fields:
-                if field not in plant:
-                    return {'valid': False, 'error': f'Plant at index {i} missing required field: {field}'}
+            if missing:
+                field = next(f for f in _REQUIRED_FIELD_ORDER if f in missing)
+                return {'valid': False, 'error': f'Plant at index {i} missing required field: {field}'}
         
         return {'valid': True}
         
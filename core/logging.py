@@ -12,51 +12,74 @@ import logging
 from logging.handlers import RotatingFileHandler
 
 # Logging System
+# Resolved once at import and shared by every logger/handler
+_LOGS_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs"))
+os.makedirs(_LOGS_DIR, exist_ok=True)
+
+_FORMATTER = logging.Formatter(
+    '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
 def setup_logger(name, log_file, level=logging.DEBUG):
     """Setup a logger with rotating file handler"""
-    # Ensure logs directory exists
-    logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
-    os.makedirs(logs_dir, exist_ok=True)
+    log_path = os.path.join(_LOGS_DIR, log_file)
     
     # Create logger
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Clear existing handlers to avoid duplicates
-    logger.handlers.clear()
+    # Already set up for this file (module imported again) - keep the existing handler
+    for existing in logger.handlers:
+        if isinstance(existing, RotatingFileHandler) and existing.baseFilename == log_path:
+            return logger
+    
+    # Remove and close any other handlers to avoid duplicates and leaked file descriptors
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+        existing.close()
     
     # Create rotating file handler (10MB max, keep 5 backup files)
     handler = RotatingFileHandler(
-        os.path.join(logs_dir, log_file),
+        log_path,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
+    handler.setFormatter(_FORMATTER)
     
     # Add handler to logger
     logger.addHandler(handler)
     
     return logger
 
+# Level names accepted by log_event, mapped to logging's numeric levels
+_LEVEL_MAP = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARN': logging.WARNING,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR,
+    'CRITICAL': logging.CRITICAL,
+}
+
+class _LazyCtx:
+    """Log message whose ' | k=v ...' context is only joined when a handler formats the record"""
+    __slots__ = ('msg', 'kw')
+    
+    def __init__(self, msg, kw):
+        self.msg = msg
+        self.kw = kw
+    
+    def __str__(self):
+        context = ' '.join([f"{k}={v}" for k, v in self.kw.items()])
+        return f"{self.msg} | {context}"
+
 def log_event(logger, level, message, **kwargs):
     """Log an event with optional additional context"""
-    if kwargs:
-        context = ' '.join([f"{k}={v}" for k, v in kwargs.items()])
-        message = f"{message} | {context}"
-    
-    if level.upper() == 'DEBUG':
-        logger.debug(message)
-    elif level.upper() == 'INFO':
-        logger.info(message)
-    elif level.upper() == 'WARN':
-        logger.warning(message)
-    elif level.upper() == 'ERROR':
-        logger.error(message)
-    elif level.upper() == 'CRITICAL':
-        logger.critical(message) 
\ No newline at end of file
+    lvl = _LEVEL_MAP.get(level) or _LEVEL_MAP.get(level.upper())
+    # Unknown level names are dropped, as before; also skip building the context
+    # string when the logger would drop the record anyway
+    if lvl is None or not logger.isEnabledFor(lvl):
+        return
+    
+    logger.log(lvl, _LazyCtx(message, kwargs) if kwargs else message)
@@ -7,11 +7,34 @@
 # 🌐 API Patterns: ~/rules/api-patterns.md
 # 💻 Coding Standards: ~/rules/coding-standards.md
 import os
+import re
+import sys
 import json
+import atexit
+import threading
+import mmap
+import bisect
+import heapq
+import functools
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 from flask import Blueprint, request, jsonify
 
+# orjson is optional - parses the library files and re-serializes map.json several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional - streams big library files' plants when orjson (and its mmap path) isn't available
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Import unified logging system
 from .logging import setup_logger, log_event
 
@@ -22,12 +45,192 @@ plants_logger = setup_logger('PLANTS', 'plants.log')
 MAP_JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "map.json")
 SCHEDULE_JSON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "schedule.json")
 LIBRARY_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "library")
+# Project root, where api.py (and its load_ini_settings) lives
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
 
 # Library file names
 LIBRARY_FILES = ['fruitbushes.json', 'fruittrees.json', 'vegetables.json', 'custom.json']
 
+# calculate_optimal_emitter_size results kept between plant_map changes
+EMITTER_CACHE_SIZE = 512
+
+# is_frequency_compatible results kept per library load (the key space is tiny in practice)
+COMPAT_CACHE_SIZE = 4096
+_LIBRARY_FALLBACK = object()  # compat cache key part when no plant_data is given
+
+# get_plant_data / get_zone_frequency answers kept until the library / schedule is reloaded
+LOOKUP_CACHE_SIZE = 1024
+
 # Available emitter sizes (GPH)
 EMITTER_SIZES = [0.2, 0.5, 1.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 15.0, 18.0, 20.0, 25.0, 30.0, 35.0, 40.0, 45.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+_EMITTER_SORTED = sorted(EMITTER_SIZES)
+
+# Tier 1 duration targets for empty zones: (minutes, hours) - 15, 20 then 25 minutes
+_TIER1_TARGETS = tuple((minutes, minutes / 60.0) for minutes in (15, 20, 25))
+
+def _nearest_emitter(gph: float) -> float:
+    """Closest available emitter size (ties go to the smaller emitter)"""
+    i = bisect.bisect_left(_EMITTER_SORTED, gph)
+    if i == 0:
+        return _EMITTER_SORTED[0]
+    if i == len(_EMITTER_SORTED):
+        return _EMITTER_SORTED[-1]
+    lower, upper = _EMITTER_SORTED[i - 1], _EMITTER_SORTED[i]
+    return lower if gph - lower <= upper - gph else upper
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# JSON files at least this big are parsed straight from an mmap (orjson only);
+# below it the mapping costs more than the read() copy it saves
+MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Without orjson, library files above this size have just their plants array streamed (needs ijson)
+STREAM_THRESHOLD_BYTES = 256 * 1024
+
+def _load_json_file(filepath: str) -> Any:
+    """Parse a read-only JSON file, mapping it instead of copying when large enough"""
+    with open(filepath, 'rb') as f:
+        if orjson is not None and os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+        return _json_loads(f.read())
+
+# map.json is a machine file - write it compact unless WATERME_PRETTY_JSON is set for debugging
+_PRETTY_JSON = bool(os.environ.get('WATERME_PRETTY_JSON'))
+
+def _json_dumps(data: Any) -> bytes:
+    """Serialize to UTF-8 bytes (compact, or 2-space indent when _PRETTY_JSON)"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if _PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if _PRETTY_JSON:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+# Seconds to coalesce map.json writes after a plant change (WATERME_FLUSH_DEBOUNCE); 0 writes every change
+# immediately. Anything that reads map.json from disk (reload_data, smart refreshes) flushes first.
+FLUSH_DEBOUNCE_SECONDS = float(os.environ.get('WATERME_FLUSH_DEBOUNCE') or 0)
+
+# Write buffer for _atomic_write_json - map.json is written in one go, so this keeps it to few syscalls
+WRITE_BUFFER_BYTES = 64 * 1024
+
+def _atomic_write_json(path: str, data: Any):
+    """Write data as JSON to path+'.tmp', fsync it, then rename over path (readers never see a partial file)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb', buffering=WRITE_BUFFER_BYTES) as f:
+        f.write(_json_dumps(data))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# Frequency codes and duration strings come from a tiny set of values, so parse each once
+@functools.lru_cache(maxsize=256)
+def _parse_frequency_code(frequency: str) -> Optional[Tuple[str, int]]:
+    """Canonicalize a frequency code like 'D1', 'w2' or 'M3' to ('D', 1), ('W', 2), ('M', 3)"""
+    if not frequency:
+        return None
+    
+    code = frequency.upper()
+    period = code[0]
+    if period not in ('D', 'W', 'M'):
+        return None
+    try:
+        return period, int(code[1:])
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=256)
+def _cycles_per_week(zone_frequency: str) -> float:
+    """Calculate cycles per week for a zone frequency code"""
+    parsed = _parse_frequency_code(zone_frequency)
+    if parsed is None:
+        return 0.0
+    
+    period, cycles = parsed
+    if period == 'D':
+        return cycles * 7.0  # 7 days per week
+    elif period == 'W':
+        return float(cycles)
+    return (cycles * 4.0) / 12.0  # Average weeks per month
+
+@functools.lru_cache(maxsize=256)
+def _cycles_per_month(frequency: str) -> int:
+    """Calculate cycles per month for a frequency code"""
+    parsed = _parse_frequency_code(frequency)
+    if parsed is None:
+        return 0
+    
+    period, cycles = parsed
+    if period == 'D':
+        return cycles * 28  # 28 days per month
+    elif period == 'W':
+        return cycles * 4  # 4 weeks per month
+    return cycles
+
+# New HH:mm:ss format, or legacy HHmmss (6 digits)
+_DURATION_RE = re.compile(r'(\d\d):(\d\d):(\d\d)|(\d\d)(\d\d)(\d\d)')
+
+@functools.lru_cache(maxsize=256)
+def _parse_duration_to_hours(duration_str: str) -> float:
+    """Parse HH:mm:ss or legacy HHmmss duration string to hours"""
+    match = _DURATION_RE.fullmatch(duration_str) if duration_str else None
+    if match is None:
+        return 0.333  # Default 20 minutes
+    
+    hours, minutes, seconds = match.group(1, 2, 3) if match.group(1) else match.group(4, 5, 6)
+    return (int(hours) * 3600 + int(minutes) * 60 + int(seconds)) / 3600.0
+
+# Tertiary matching packs a code into one int - (ord(period) << 16) | count - so that
+# "same period, count off by at most one" is a single subtraction.  Only exact
+# 'D'/'W'/'M' prefixes with a count of 1..0xFFFF pack; anything else is 0 (never adjacent).
+_FREQ_COUNT_MASK = 0xFFFF
+
+@functools.lru_cache(maxsize=256)
+def _pack_frequency(frequency: str) -> int:
+    """Pack a frequency code like 'D1' as (ord('D') << 16) | 1, or 0 if it can't be packed"""
+    if not frequency or frequency[0] not in ('D', 'W', 'M'):
+        return 0
+    try:
+        count = int(frequency[1:])
+    except ValueError:
+        return 0
+    if not 0 < count <= _FREQ_COUNT_MASK:
+        return 0
+    return (ord(frequency[0]) << 16) | count
+
+# Cross-category frequency pairs that still count as a tertiary (adjacent) match
+_SPECIAL_PAIRS = frozenset({
+    ('W6', 'D1'), ('D1', 'W6'),  # 24 cycles <-> 28 cycles
+    ('M3', 'W1'), ('W1', 'M3'),  # 3 cycles <-> 4 cycles
+})
+_SPECIAL_PACKED_PAIRS = frozenset((_pack_frequency(a), _pack_frequency(b)) for a, b in _SPECIAL_PAIRS)
+
+# Frequency part of a zone score for each compatibility level
+_LEVEL_SCORES = {'primary': 1.0, 'secondary': 0.8, 'tertiary': 0.6}
+
+# The library fields the placement and sizing code reads, pulled out of the plant dict once at load
+PlantRec = namedtuple('PlantRec', ['freqs', 'water_opt', 'root_area', 'frequency', 'tolerance_min', 'tolerance_max', 'raw'])
+
+def _plant_rec(plant: Dict[str, Any]) -> PlantRec:
+    # Library entries may hold a single watering_frequency code - always a tuple here
+    watering_frequency = plant.get('watering_frequency', [])
+    return PlantRec(
+        freqs=tuple(watering_frequency) if isinstance(watering_frequency, list) else (watering_frequency,),
+        water_opt=plant.get('water_optimal_in_week', 0),
+        root_area=plant.get('root_area_sqft', 0),
+        frequency=plant.get('frequency', 'moderate'),
+        tolerance_min=plant.get('tolerance_min_in_week', 0),
+        tolerance_max=plant.get('tolerance_max_in_week', 0),
+        raw=plant
+    )
+
+# One plant_library entry - a tuple instead of a 4-key dict per plant
+_PlantEntry = namedtuple('_PlantEntry', ['data', 'source', 'original_plant_id', 'unique_plant_id', 'rec'])
 
 # Flask Blueprint for Plant Manager API endpoints
 plant_bp = Blueprint('plant_manager', __name__)
@@ -37,123 +240,347 @@ class PlantManager:
     
     def __init__(self):
         self.plant_map = {}
-        self.plant_library = {}
-        self.schedule_data = {}
+        self._plants_by_zone = {}  # zone_id -> [instance_id, ...] in plant_map order
+        self._map_rank = {}  # instance_id -> insertion rank in plant_map (keeps _plants_by_zone in map order)
+        self._next_rank = 0
+        self._next_id = 1  # next instance id to hand out (monotonic - ids freed by deletes are not reused)
+        self._plant_library = None  # loaded on first use - see the plant_library property
+        self._plants_by_original_id = {}  # original plant_id -> first unique_plant_id across libraries
+        self._freq_compat_index = {}  # plant watering frequency -> set of compatible zone frequencies
+        self._schedule_data = None  # loaded on first use - see the schedule_data property
+        self._zone_by_id = {}  # zone_id -> zone for the legacy 'zones' array in schedule.json
+        self._active_zones = ()  # (zone_id, zone) for every non-disabled zone, keyed zones then legacy array
+        self._active_zone_ids = ()  # just the zone_ids of _active_zones, for loops that never touch the zone dict
+        self._scheduler = None  # core.scheduler's instance, imported on first use (see _get_scheduler)
+        self._bulk_depth = 0  # >0 while inside bulk_update(): map.json writes and zone refreshes wait
+        self._dirty = False  # plant_map has changes not yet written to map.json
+        self._flush_timer = None  # pending debounced write (FLUSH_DEBOUNCE_SECONDS > 0 only)
+        self._flush_lock = threading.RLock()  # serializes flush() against the debounce timer thread
+        self._pending_refresh_zones = {}  # zones to refresh when the outermost bulk_update() exits
+        self._emitter_cache = {}  # (plant_id, library_book, zone_id, is_new_placement) -> emitter calculation
+        self._compat_cache = {}  # (plant_frequency, zone_frequency, compatible frequencies) -> (is_compatible, level)
+        self._plant_entry_cache = {}  # (plant_id, library_book) -> _PlantEntry or None
+        self._zone_freq_cache = {}  # zone_id -> frequency code or None
+        self._zone_duration_cache = {}  # zone_id -> duration in hours
+        self._max_threshold_cache = None  # parsed max_duration_threshold (hours) from settings.cfg
+        self._lib_cache = {}  # library filename -> (mtime_ns, size, parsed data); survives reload_data()
         self._load_data()
     
     def _load_data(self):
-        """Load all plant-related data files"""
+        """Load all plant-related data files (library and schedule lazily, on first use)"""
         self._load_plant_map()
-        self._load_plant_library()
-        self._load_schedule()
+        self._plant_library = None
+        self._schedule_data = None
+        self._plant_entry_cache.clear()
+        self._zone_freq_cache.clear()
+        self._zone_duration_cache.clear()
+        self._max_threshold_cache = None  # settings.cfg may have changed too
+    
+    # The library and schedule indexes (_plants_by_original_id, _freq_compat_index, _zone_by_id,
+    # _active_zones, _active_zone_ids) are only valid once the matching _ensure_* / property below has run
+    def _get_scheduler(self):
+        """The scheduler instance, imported lazily (scheduler imports this module) and kept after the first call"""
+        if self._scheduler is None:
+            from .scheduler import scheduler
+            self._scheduler = scheduler
+        return self._scheduler
+    
+    def _ensure_plant_library(self) -> Dict[str, '_PlantEntry']:
+        """Load the library files (and their indexes) if they haven't been yet"""
+        if self._plant_library is None:
+            self._load_plant_library()
+        return self._plant_library
+    
+    @property
+    def plant_library(self) -> Dict[str, '_PlantEntry']:
+        return self._ensure_plant_library()
+    
+    def _ensure_schedule(self) -> Dict[str, Any]:
+        """Load schedule.json (and its zone indexes) if it hasn't been yet"""
+        if self._schedule_data is None:
+            self._load_schedule()
+        return self._schedule_data
+    
+    @property
+    def schedule_data(self) -> Dict[str, Any]:
+        return self._ensure_schedule()
     
     def _load_plant_map(self):
         """Load plant instance data from map.json"""
         try:
-            if os.path.exists(MAP_JSON_PATH):
-                with open(MAP_JSON_PATH, 'r', encoding='utf-8') as f:
-                    self.plant_map = json.load(f)
-                log_event(plants_logger, 'INFO', 'Plant map loaded', 
-                         instance_count=len(self.plant_map))
-            else:
-                self.plant_map = {}
-                log_event(plants_logger, 'INFO', 'Plant map file not found, using empty map')
+            self.plant_map = _load_json_file(MAP_JSON_PATH)
+            log_event(plants_logger, 'INFO', 'Plant map loaded', 
+                     instance_count=len(self.plant_map))
+        except FileNotFoundError:
+            self.plant_map = {}
+            log_event(plants_logger, 'INFO', 'Plant map file not found, using empty map')
         except Exception as e:
             log_event(plants_logger, 'ERROR', 'Failed to load plant map', error=str(e))
             self.plant_map = {}
+        self._next_id = max((int(k) for k in self.plant_map if k.isdigit()), default=0) + 1
+        self._index_plant_map()
+    
+    def _index_plant_map(self):
+        """Rebuild the zone_id -> instance ids index from scratch (after a load or a failed update)"""
+        # Zone occupancy and emitters feed into emitter sizing, and reload_data() lands here too
+        self._emitter_cache.clear()
+        plants_by_zone = {}
+        for instance_id, plant_data in self.plant_map.items():
+            plants_by_zone.setdefault(plant_data.get('zone_id'), []).append(instance_id)
+        self._plants_by_zone = plants_by_zone
+        self._map_rank = {instance_id: rank for rank, instance_id in enumerate(self.plant_map)}
+        self._next_rank = len(self._map_rank)
+    
+    # Incremental index upkeep - the mutators call these so a change costs O(plants in the zone), not O(map)
+    
+    def _index_insert(self, instance_id: str, zone_id: Optional[int]):
+        """Add an instance to its zone's list at its plant_map position (the end, for a new instance)"""
+        if instance_id not in self._map_rank:
+            self._map_rank[instance_id] = self._next_rank
+            self._next_rank += 1
+        rank = self._map_rank
+        instance_rank = rank[instance_id]
+        instance_ids = self._plants_by_zone.setdefault(zone_id, [])
+        pos = len(instance_ids)
+        while pos and rank[instance_ids[pos - 1]] > instance_rank:
+            pos -= 1
+        instance_ids.insert(pos, instance_id)
+    
+    def _index_remove(self, instance_id: str, zone_id: Optional[int]):
+        """Drop an instance from its zone's list (the zone key goes when it empties)"""
+        instance_ids = self._plants_by_zone.get(zone_id)
+        if instance_ids is None or instance_id not in instance_ids:
+            return
+        instance_ids.remove(instance_id)
+        if not instance_ids:
+            del self._plants_by_zone[zone_id]
+    
+    def _index_move(self, instance_id: str, old_zone_id: Optional[int], new_zone_id: Optional[int]):
+        """Move an instance between zone lists (no-op when the zone didn't change)"""
+        if old_zone_id != new_zone_id:
+            self._index_remove(instance_id, old_zone_id)
+            self._index_insert(instance_id, new_zone_id)
+    
+    def _read_library_file(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Read and parse one library file (None if missing or unreadable), reusing the last parse while unchanged"""
+        filepath = os.path.join(LIBRARY_DIR, filename)
+        try:
+            st = os.stat(filepath)
+            cached = self._lib_cache.get(filename)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+            if orjson is None and ijson is not None and st.st_size > STREAM_THRESHOLD_BYTES:
+                # Only 'plants' is used, so skip holding the whole file and its stdlib DOM at once
+                with open(filepath, 'rb') as f:
+                    data = {'plants': list(ijson.items(f, 'plants.item', use_float=True))}
+            else:
+                data = _load_json_file(filepath)
+            self._lib_cache[filename] = (st.st_mtime_ns, st.st_size, data)
+            return data
+        except FileNotFoundError:
+            self._lib_cache.pop(filename, None)
+            return None
+        except Exception as e:
+            log_event(plants_logger, 'ERROR', f'Failed to load library file', 
+                     filename=filename, error=str(e))
+            return None
     
     def _load_plant_library(self):
         """Load plant library data from all library files"""
-        self.plant_library = {}
-        for filename in LIBRARY_FILES:
-            filepath = os.path.join(LIBRARY_DIR, filename)
+        # Build into locals and publish at the end so a concurrent first request never sees a partial library
+        plant_library = {}
+        plants_by_original_id = {}
+        # The files are independent, so read/parse them concurrently and merge in LIBRARY_FILES order
+        with ThreadPoolExecutor(max_workers=len(LIBRARY_FILES)) as executor:
+            library_data = list(executor.map(self._read_library_file, LIBRARY_FILES))
+        for filename, data in zip(LIBRARY_FILES, library_data):
+            if data is None:
+                continue
             try:
-                if os.path.exists(filepath):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if 'plants' in data:
-                            for plant in data['plants']:
-                                plant_id = plant.get('plant_id')
-                                if plant_id:
-                                    # Create unique plant ID by combining library name and plant ID
-                                    # This prevents conflicts between different library files
-                                    library_name = filename.replace('.json', '')
-                                    unique_plant_id = f"{library_name}_{plant_id}"
-                                    
-                                    # Store both the original plant_id and the unique ID
-                                    plant_data = plant.copy()
-                                    plant_data['original_plant_id'] = plant_id
-                                    plant_data['library_name'] = library_name
-                                    
-                                    self.plant_library[unique_plant_id] = {
-                                        'data': plant_data,
-                                        'source': filename,
-                                        'original_plant_id': plant_id,
-                                        'unique_plant_id': unique_plant_id
-                                    }
-                    log_event(plants_logger, 'INFO', f'Library file loaded', 
-                             filename=filename, plant_count=len(data.get('plants', [])))
+                if 'plants' in data:
+                    library_name = sys.intern(filename.replace('.json', ''))
+                    unique_id_prefix = library_name + '_'
+                    for plant in data['plants']:
+                        plant_id = plant.get('plant_id')
+                        if plant_id:
+                            # Create unique plant ID by combining library name and plant ID
+                            # This prevents conflicts between different library files
+                            unique_plant_id = unique_id_prefix + str(plant_id)
+                            
+                            # Store both the original plant_id and the unique ID
+                            # (the parsed file is discarded after this loop, so annotate in place)
+                            plant['original_plant_id'] = plant_id
+                            plant['library_name'] = library_name
+                            
+                            plant_library[unique_plant_id] = _PlantEntry(
+                                data=plant,
+                                source=filename,
+                                original_plant_id=plant_id,
+                                unique_plant_id=unique_plant_id,
+                                rec=_plant_rec(plant)
+                            )
+                            plants_by_original_id.setdefault(plant_id, unique_plant_id)
+                log_event(plants_logger, 'INFO', f'Library file loaded', 
+                         filename=filename, plant_count=len(data.get('plants', [])))
             except Exception as e:
                 log_event(plants_logger, 'ERROR', f'Failed to load library file', 
                          filename=filename, error=str(e))
         
+        self._plants_by_original_id = plants_by_original_id
+        self._freq_compat_index = self._index_frequency_compatibility(plant_library)
+        self._compat_cache.clear()  # the secondary-match fallback reads _freq_compat_index
+        self._plant_entry_cache.clear()
+        self._plant_library = plant_library
         log_event(plants_logger, 'INFO', 'Plant library loaded', 
-                 total_plants=len(self.plant_library))
+                 total_plants=len(plant_library))
+    
+    def _index_frequency_compatibility(self, plant_library: Dict[str, '_PlantEntry']) -> Dict[Any, set]:
+        """Map each plant watering frequency to the union of its compatible frequencies across the library"""
+        freq_compat_index = {}
+        for plant_info in plant_library.values():
+            compatible_frequencies = plant_info.data.get('compatible_watering_frequencies', [])
+            if not isinstance(compatible_frequencies, list):
+                continue
+            for plant_frequency in plant_info.rec.freqs:
+                freq_compat_index.setdefault(plant_frequency, set()).update(compatible_frequencies)
+        return freq_compat_index
     
     def _load_schedule(self):
         """Load schedule data for zone information"""
         try:
-            if os.path.exists(SCHEDULE_JSON_PATH):
-                with open(SCHEDULE_JSON_PATH, 'r', encoding='utf-8') as f:
-                    raw_schedule_data = json.load(f)
-                
-                # Store the schedule data in its original format (zone IDs as keys)
-                # This matches the actual schedule.json structure
-                self.schedule_data = raw_schedule_data
-                
-                log_event(plants_logger, 'INFO', 'Schedule data loaded', 
-                         zone_count=len(raw_schedule_data))
-            else:
-                self.schedule_data = {}
-                log_event(plants_logger, 'INFO', 'Schedule file not found, using empty schedule')
+            raw_schedule_data = _load_json_file(SCHEDULE_JSON_PATH)
+            
+            # Store the schedule data in its original format (zone IDs as keys)
+            # This matches the actual schedule.json structure
+            schedule_data = raw_schedule_data
+            
+            log_event(plants_logger, 'INFO', 'Schedule data loaded', 
+                     zone_count=len(raw_schedule_data))
+        except FileNotFoundError:
+            schedule_data = {}
+            log_event(plants_logger, 'INFO', 'Schedule file not found, using empty schedule')
         except Exception as e:
             log_event(plants_logger, 'ERROR', 'Failed to load schedule data', error=str(e))
-            self.schedule_data = {}
+            schedule_data = {}
+        
+        # Index the legacy zones array once instead of scanning it on every lookup (first entry wins)
+        zone_by_id = {}
+        for zone in schedule_data.get('zones', []):
+            zone_by_id.setdefault(zone.get('zone_id'), zone)
+        
+        # Uppercase periods once here so frequency codes built from them ('D1', 'W2', ...) are canonical
+        for zone in (*schedule_data.values(), *zone_by_id.values()):
+            if isinstance(zone, dict) and isinstance(zone.get('period'), str):
+                zone['period'] = zone['period'].upper()
+        
+        # Zones the placement logic walks: numeric schedule.json keys, then the legacy array, minus disabled ones
+        active_zones = []
+        for zone_key, zone in schedule_data.items():
+            try:
+                zone_id = int(zone_key)
+            except ValueError:
+                continue  # Skip non-numeric keys
+            if zone.get('mode') != 'disabled':
+                active_zones.append((zone_id, zone))
+        for zone in schedule_data.get('zones', []):
+            zone_id = zone.get('zone_id')
+            if zone_id and zone.get('mode') != 'disabled':
+                active_zones.append((zone_id, zone))
+        self._active_zones = tuple(active_zones)
+        self._active_zone_ids = tuple(zone_id for zone_id, zone in active_zones)
+        self._zone_by_id = zone_by_id
+        self._zone_freq_cache.clear()
+        self._zone_duration_cache.clear()
+        self._emitter_cache.clear()  # sizing depends on zone mode, frequency and duration
+        self._schedule_data = schedule_data
     
     def reload_data(self):
         """Reload all data files"""
+        self._flush_pending()  # don't drop a debounced write by re-reading map.json under it
         self._load_data()
     
+    def _save_plant_map(self):
+        """Persist plant_map after a change - deferred while inside bulk_update() or debounced"""
+        # The mutators keep _plants_by_zone current; occupancy and emitters feed into emitter sizing
+        self._emitter_cache.clear()
+        self._dirty = True
+        if self._bulk_depth:
+            return
+        if FLUSH_DEBOUNCE_SECONDS > 0:
+            self._schedule_flush()
+        else:
+            self.flush()
+    
+    def _schedule_flush(self):
+        """Start the debounce timer unless one is already pending (changes until it fires share its write)"""
+        with self._flush_lock:
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_DEBOUNCE_SECONDS, self._flush_pending)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _flush_pending(self):
+        """Write any debounced changes now (timer callback and atexit hook - logs instead of raising)"""
+        with self._flush_lock:
+            if self._flush_timer is None:
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                log_event(plants_logger, 'ERROR', 'Failed to write debounced plant map', error=str(e))
+    
+    def flush(self):
+        """Write plant_map to map.json atomically (raises on failure so callers can report it)"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            _atomic_write_json(MAP_JSON_PATH, self.plant_map)
+            self._dirty = False
+    
+    @contextmanager
+    def bulk_update(self):
+        """
+        Group several plant instance changes into one map.json write.
+        Smart refreshes for touched zones run once each, after the write.
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if not self._bulk_depth:
+                if self._dirty:
+                    self.flush()
+                pending = list(self._pending_refresh_zones)
+                self._pending_refresh_zones.clear()
+                for zone_id in pending:
+                    self._trigger_zone_smart_refresh(zone_id)
+    
     # Smart Emitter Sizing Methods
     
     def calculate_cycles_per_week(self, zone_frequency: str) -> float:
         """Calculate cycles per week for a zone frequency code"""
-        if not zone_frequency:
-            return 0.0
-        
-        code = zone_frequency.upper()
-        if code.startswith('D'):
-            try:
-                cycles_per_day = int(code[1:])
-                return cycles_per_day * 7.0  # 7 days per week
-            except ValueError:
-                return 0.0
-        elif code.startswith('W'):
-            try:
-                cycles_per_week = int(code[1:])
-                return float(cycles_per_week)
-            except ValueError:
-                return 0.0
-        elif code.startswith('M'):
-            try:
-                cycles_per_month = int(code[1:])
-                return (cycles_per_month * 4.0) / 12.0  # Average weeks per month
-            except ValueError:
-                return 0.0
-        return 0.0
+        return _cycles_per_week(zone_frequency)
     
     def get_zone_duration_hours(self, zone_id: int) -> float:
         """Get zone duration in hours"""
+        # Fixed until the schedule is reloaded - emitter sizing asks for it once per plant x zone
+        try:
+            return self._zone_duration_cache[zone_id]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._lookup_zone_duration_hours(zone_id)
+        
+        duration_hours = self._lookup_zone_duration_hours(zone_id)
+        if len(self._zone_duration_cache) >= LOOKUP_CACHE_SIZE:
+            self._zone_duration_cache.clear()
+        self._zone_duration_cache[zone_id] = duration_hours
+        return duration_hours
+    
+    def _lookup_zone_duration_hours(self, zone_id: int) -> float:
+        """Uncached body of get_zone_duration_hours"""
         # Handle the actual schedule.json structure where zones are direct keys
         zone_key = str(zone_id)
         if zone_key in self.schedule_data:
@@ -169,45 +596,23 @@ class PlantManager:
                 return self._parse_duration_to_hours(duration_str)
         
         # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            if zone.get('zone_id') == zone_id:
-                # Check for times array (multiple watering events)
-                if 'times' in zone and isinstance(zone['times'], list) and len(zone['times']) > 0:
-                    # Use the first time's duration as representative
-                    duration_str = zone['times'][0].get('duration', '00:20:00')
-                    return self._parse_duration_to_hours(duration_str)
-                # Check for single time
-                elif 'time' in zone and isinstance(zone['time'], dict):
-                    duration_str = zone['time'].get('duration', '00:20:00')
-                    return self._parse_duration_to_hours(duration_str)
+        zone = self._zone_by_id.get(zone_id)
+        if zone is not None:
+            # Check for times array (multiple watering events)
+            if 'times' in zone and isinstance(zone['times'], list) and len(zone['times']) > 0:
+                # Use the first time's duration as representative
+                duration_str = zone['times'][0].get('duration', '00:20:00')
+                return self._parse_duration_to_hours(duration_str)
+            # Check for single time
+            elif 'time' in zone and isinstance(zone['time'], dict):
+                duration_str = zone['time'].get('duration', '00:20:00')
+                return self._parse_duration_to_hours(duration_str)
         
         return 0.333  # Default to 20 minutes if not found
     
     def _parse_duration_to_hours(self, duration_str: str) -> float:
         """Parse HH:mm:ss or legacy HHmmss duration string to hours"""
-        if not duration_str:
-            return 0.333  # Default 20 minutes
-        
-        try:
-            # Handle new HH:mm:ss format
-            if ':' in duration_str and len(duration_str) == 8:
-                parts = duration_str.split(':')
-                if len(parts) == 3:
-                    hours = int(parts[0])
-                    minutes = int(parts[1])
-                    seconds = int(parts[2])
-                    return hours + (minutes / 60.0) + (seconds / 3600.0)
-            
-            # Handle legacy HHmmss format (6 digits)
-            elif len(duration_str) == 6 and duration_str.isdigit():
-                hours = int(duration_str[0:2])
-                minutes = int(duration_str[2:4])
-                seconds = int(duration_str[4:6])
-                return hours + (minutes / 60.0) + (seconds / 3600.0)
-            
-            return 0.333  # Default 20 minutes
-        except ValueError:
-            return 0.333  # Default 20 minutes
+        return _parse_duration_to_hours(duration_str)
     
     def calculate_flexible_duration_target(self, plant_data: Dict[str, Any], cycles_per_week: float, zone_id: int) -> Tuple[float, str, str]:
         """
@@ -234,8 +639,7 @@ class PlantManager:
         max_duration_threshold_hours = self.get_max_duration_threshold_hours()
         
         # Tier 1: Target 15-25 minutes using 4-10 GPH emitters
-        for target_minutes in [15, 20, 25]:
-            target_duration_hours = target_minutes / 60.0
+        for target_minutes, target_duration_hours in _TIER1_TARGETS:
             required_gph = per_cycle_volume / target_duration_hours
             
             # Check if we can use 4-10 GPH emitters
@@ -257,11 +661,17 @@ class PlantManager:
         return target_duration_hours, "tier4_beyond_threshold", f"Tier 4: {target_duration_hours*60:.1f} min with 25 GPH emitter (BEYOND {max_duration_threshold_hours*60:.0f} min threshold)"
     
     def get_max_duration_threshold_hours(self) -> float:
-        """Get max duration threshold from settings, default 2 hours"""
+        """Get max duration threshold from settings, default 2 hours (read once per reload_data())"""
+        if self._max_threshold_cache is None:
+            self._max_threshold_cache = self._load_max_duration_threshold_hours()
+        return self._max_threshold_cache
+    
+    def _load_max_duration_threshold_hours(self) -> float:
+        """Uncached body of get_max_duration_threshold_hours"""
         try:
-            import sys
-            import os
-            sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+            if PROJECT_ROOT not in sys.path:
+                sys.path.append(PROJECT_ROOT)
+            # Imported here to avoid circular import (api imports this module)
             from api import load_ini_settings
             settings = load_ini_settings()
             threshold_str = settings.get('max_duration_threshold', '02:00')
@@ -280,18 +690,38 @@ class PlantManager:
         """
         Calculate optimal emitter size for a plant in a specific zone
         
+        Results are cached until the next plant_map change or schedule load (reload_data() or
+        _load_schedule()); treat them as read-only.
+        
         Returns:
             Dict with calculation results and health validation
         """
-        plant_library_data = self.get_plant_data(
+        cache_key = (plant_data.get('plant_id'), plant_data.get('library_book'), zone_id, is_new_placement)
+        try:
+            cached = self._emitter_cache.get(cache_key)
+        except TypeError:  # unhashable ids straight from a request body - just calculate
+            return self._calculate_optimal_emitter_size(plant_data, zone_id, is_new_placement)
+        if cached is not None:
+            return cached
+        
+        result = self._calculate_optimal_emitter_size(plant_data, zone_id, is_new_placement)
+        if len(self._emitter_cache) >= EMITTER_CACHE_SIZE:
+            self._emitter_cache.pop(next(iter(self._emitter_cache), None), None)  # drop the oldest entry
+        self._emitter_cache[cache_key] = result
+        return result
+    
+    def _calculate_optimal_emitter_size(self, plant_data: Dict[str, Any], zone_id: int, is_new_placement: bool) -> Dict[str, Any]:
+        """Uncached body of calculate_optimal_emitter_size"""
+        plant_rec = self.get_plant_rec(
             plant_data.get('plant_id'), 
             plant_data.get('library_book')
         )
-        if not plant_library_data:
+        if not plant_rec:
             return {
                 'success': False,
                 'error': 'Plant not found in library'
             }
+        plant_library_data = plant_rec.raw
         
         # Check zone mode first
         zone_mode = self._get_zone_mode(zone_id)
@@ -320,10 +750,10 @@ class PlantManager:
             }
         
         # Get plant water requirements
-        water_optimal_in_week = plant_library_data.get('water_optimal_in_week', 0)
-        root_area_sqft = plant_library_data.get('root_area_sqft', 0)
-        tolerance_min_in_week = plant_library_data.get('tolerance_min_in_week', 0)
-        tolerance_max_in_week = plant_library_data.get('tolerance_max_in_week', 0)
+        water_optimal_in_week = plant_rec.water_opt
+        root_area_sqft = plant_rec.root_area
+        tolerance_min_in_week = plant_rec.tolerance_min
+        tolerance_max_in_week = plant_rec.tolerance_max
         
         if water_optimal_in_week <= 0 or root_area_sqft <= 0:
             return {
@@ -341,8 +771,7 @@ class PlantManager:
             }
         
         # Check if zone is empty (no plants currently in the zone)
-        zone_plants = self.get_zone_plants(zone_id)
-        is_empty_zone = len(zone_plants) == 0
+        is_empty_zone = not self.zone_has_plants(zone_id)
         
         # Smart mode duration logic with 4-tier flexible targeting:
         if is_empty_zone:
@@ -413,10 +842,10 @@ class PlantManager:
                          calculated_optimal=calculated_gph)
             else:
                 # Fallback if no current emitter found (shouldn't happen)
-                nearest_emitter = min(EMITTER_SIZES, key=lambda x: abs(x - target_emitter_gph))
+                nearest_emitter = _nearest_emitter(target_emitter_gph)
         else:
             # Find nearest available emitter size for new zones
-            nearest_emitter = min(EMITTER_SIZES, key=lambda x: abs(x - target_emitter_gph))
+            nearest_emitter = _nearest_emitter(target_emitter_gph)
         
         log_event(plants_logger, 'DEBUG', 'Emitter selection', 
                  calculated_gph=calculated_gph,
@@ -544,12 +973,11 @@ class PlantManager:
         if not plant_data:
             return False, "Invalid plant data", None
         
-        # Find next available instance ID
-        next_instance_id = 1
-        while str(next_instance_id) in self.plant_map:
-            next_instance_id += 1
-        
-        instance_id = str(next_instance_id)
+        # Next instance ID from the running counter
+        while str(self._next_id) in self.plant_map:
+            self._next_id += 1
+        instance_id = str(self._next_id)
+        self._next_id += 1
         
         # Add smart_overrides if not present (duration is handled by schedule.json)
         if 'smart_overrides' not in plant_data:
@@ -561,10 +989,10 @@ class PlantManager:
         # Save to map
         try:
             self.plant_map[instance_id] = plant_data
+            self._index_insert(instance_id, plant_data.get('zone_id'))
             
             # Save to file
-            with open(MAP_JSON_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.plant_map, f, indent=2)
+            self._save_plant_map()
             
             log_event(plants_logger, 'INFO', 'Plant instance added', 
                      instance_id=instance_id,
@@ -607,17 +1035,21 @@ class PlantManager:
         old_location_id = self.plant_map[instance_id].get('location_id')
         old_zone_id = self.plant_map[instance_id].get('zone_id')
         
+        # Nothing to rewrite or refresh if the plant is already there
+        if new_location_id == old_location_id and (new_zone_id is None or new_zone_id == old_zone_id):
+            return True, f"Plant instance {instance_id} unchanged"
+        
         # Update location_id
         self.plant_map[instance_id]['location_id'] = new_location_id
         
         # Update zone_id if provided
         if new_zone_id is not None:
             self.plant_map[instance_id]['zone_id'] = new_zone_id
+            self._index_move(instance_id, old_zone_id, new_zone_id)
         
         try:
             # Save to file
-            with open(MAP_JSON_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.plant_map, f, indent=2)
+            self._save_plant_map()
             
             changes = f"location {old_location_id} → {new_location_id}"
             if new_zone_id is not None and new_zone_id != old_zone_id:
@@ -659,15 +1091,20 @@ class PlantManager:
         
         old_data = self.plant_map[instance_id].copy()
         
+        # Nothing to rewrite or refresh if every field already holds the requested value
+        if all(key == 'instance_id' or (key in old_data and type(old_data[key]) is type(value) and old_data[key] == value)
+               for key, value in updated_data.items()):
+            return True, f"Plant instance {instance_id} unchanged"
+        
         # Update the fields
         for key, value in updated_data.items():
             if key != 'instance_id':  # Don't allow changing the instance ID
                 self.plant_map[instance_id][key] = value
+        self._index_move(instance_id, old_data.get('zone_id'), self.plant_map[instance_id].get('zone_id'))
         
         try:
             # Save to file
-            with open(MAP_JSON_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.plant_map, f, indent=2)
+            self._save_plant_map()
             
             # Log the changes
             changes = []
@@ -695,6 +1132,7 @@ class PlantManager:
         except Exception as e:
             # Restore original data on error
             self.plant_map[instance_id] = old_data
+            self._index_plant_map()
             log_event(plants_logger, 'ERROR', 'Failed to update plant instance', 
                      instance_id=instance_id, error=str(e))
             return False, f"Failed to update plant instance: {str(e)}"
@@ -711,11 +1149,12 @@ class PlantManager:
         
         plant_info = self.plant_map[instance_id]
         del self.plant_map[instance_id]
+        self._index_remove(instance_id, plant_info.get('zone_id'))
+        self._map_rank.pop(instance_id, None)
         
         try:
             # Save to file
-            with open(MAP_JSON_PATH, 'w', encoding='utf-8') as f:
-                json.dump(self.plant_map, f, indent=2)
+            self._save_plant_map()
             
             log_event(plants_logger, 'INFO', 'Plant instance deleted', 
                      instance_id=instance_id,
@@ -729,17 +1168,11 @@ class PlantManager:
             if zone_id:
                 self._trigger_zone_smart_refresh(zone_id)
                 # Check if the zone is now empty and disable if so
-                zone_plants = self.get_zone_plants(zone_id)
-                if len(zone_plants) == 0:
+                if not self.zone_has_plants(zone_id):
                     try:
                         # Purge zone configuration when it becomes empty (same as UI deactivation)
-                        # Use API endpoint to avoid circular import
-                        import requests
-                        response = requests.post(f'http://localhost:5000/api/scheduler/update-zone-mode', 
-                                               json={'zone_id': zone_id, 'new_mode': 'disabled', 'purge_config': True})
-                        if response.status_code != 200:
-                            log_event(plants_logger, 'ERROR', 'Failed to disable empty zone via API', 
-                                    zone_id=zone_id, status_code=response.status_code)
+                        if not self._get_scheduler().update_zone_mode(zone_id, 'disabled', purge_config=True):
+                            log_event(plants_logger, 'ERROR', 'Failed to disable empty zone', zone_id=zone_id)
                     except Exception as e:
                         log_event(plants_logger, 'ERROR', 'Failed to disable empty zone', zone_id=zone_id, error=str(e))
             
@@ -752,6 +1185,31 @@ class PlantManager:
     
     def get_plant_data(self, plant_id: int, library_book: str = None) -> Optional[Dict[str, Any]]:
         """Get plant library data by plant_id and optionally library_book"""
+        entry = self._get_plant_entry(plant_id, library_book)
+        return entry.data if entry else None
+    
+    def get_plant_rec(self, plant_id: int, library_book: str = None) -> Optional[PlantRec]:
+        """Like get_plant_data, but the pre-extracted PlantRec for hot loops"""
+        entry = self._get_plant_entry(plant_id, library_book)
+        return entry.rec if entry else None
+    
+    def _get_plant_entry(self, plant_id: int, library_book: str = None) -> Optional[_PlantEntry]:
+        cache_key = (plant_id, library_book)
+        try:
+            return self._plant_entry_cache[cache_key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable plant_id straight from a request body
+            return self._lookup_plant_entry(plant_id, library_book)
+        
+        entry = self._lookup_plant_entry(plant_id, library_book)
+        if len(self._plant_entry_cache) >= LOOKUP_CACHE_SIZE:
+            self._plant_entry_cache.clear()
+        self._plant_entry_cache[cache_key] = entry
+        return entry
+    
+    def _lookup_plant_entry(self, plant_id: int, library_book: str = None) -> Optional[_PlantEntry]:
+        """Uncached library lookup behind get_plant_data / get_plant_rec"""
         # Debug logging
         log_event(plants_logger, 'DEBUG', 'get_plant_data called', 
                  plant_id=plant_id, library_book=library_book)
@@ -765,8 +1223,8 @@ class PlantManager:
             if plant_info:
                 log_event(plants_logger, 'DEBUG', 'Plant found with unique ID', 
                          unique_plant_id=unique_plant_id,
-                         plant_name=plant_info['data'].get('common_name'))
-                return plant_info['data']
+                         plant_name=plant_info.data.get('common_name'))
+                return plant_info
             else:
                 log_event(plants_logger, 'DEBUG', 'Plant not found with unique ID', 
                          unique_plant_id=unique_plant_id)
@@ -774,13 +1232,15 @@ class PlantManager:
                 # This prevents finding the wrong plant from a different library
                 return None
         
-        # Fallback: search for plant_id across all libraries (only when library_book is not provided)
-        for unique_id, plant_info in self.plant_library.items():
-            if plant_info.get('original_plant_id') == plant_id:
-                log_event(plants_logger, 'DEBUG', 'Plant found with fallback search', 
-                         unique_id=unique_id,
-                         plant_name=plant_info['data'].get('common_name'))
-                return plant_info['data']
+        # Fallback: first library holding this plant_id (only when library_book is not provided)
+        plant_library = self._ensure_plant_library()
+        unique_id = self._plants_by_original_id.get(plant_id)
+        if unique_id is not None:
+            plant_info = plant_library[unique_id]
+            log_event(plants_logger, 'DEBUG', 'Plant found with fallback search', 
+                     unique_id=unique_id,
+                     plant_name=plant_info.data.get('common_name'))
+            return plant_info
         
         log_event(plants_logger, 'DEBUG', 'Plant not found in any library', 
                  plant_id=plant_id, library_book=library_book)
@@ -788,26 +1248,38 @@ class PlantManager:
     
     def get_zone_plants(self, zone_id: int) -> List[Dict[str, Any]]:
         """Get all plants in a specific zone"""
-        zone_plants = []
-        for instance_id, plant_data in self.plant_map.items():
-            if plant_data.get('zone_id') == zone_id:
-                zone_plants.append({
-                    'instance_id': instance_id,
-                    **plant_data
-                })
-        return zone_plants
+        return [{'instance_id': instance_id, **self.plant_map[instance_id]} 
+                for instance_id in self._plants_by_zone.get(zone_id, ())]
+    
+    def zone_has_plants(self, zone_id: int) -> bool:
+        """Check whether any plant instance is assigned to a zone"""
+        return bool(self._plants_by_zone.get(zone_id))
     
     def get_current_zone_emitter_size(self, zone_id: int) -> Optional[float]:
         """Get the current emitter size for a zone if it has plants"""
-        for instance_id, plant_data in self.plant_map.items():
-            if plant_data.get('zone_id') == zone_id:
-                emitter_size = plant_data.get('emitter_size')
-                if emitter_size is not None:
-                    return float(emitter_size)
+        for instance_id in self._plants_by_zone.get(zone_id, ()):
+            emitter_size = self.plant_map[instance_id].get('emitter_size')
+            if emitter_size is not None:
+                return float(emitter_size)
         return None
     
     def get_zone_frequency(self, zone_id: int) -> Optional[str]:
         """Get the frequency setting for a zone"""
+        try:
+            return self._zone_freq_cache[zone_id]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._lookup_zone_frequency(zone_id)
+        
+        frequency = self._lookup_zone_frequency(zone_id)
+        if len(self._zone_freq_cache) >= LOOKUP_CACHE_SIZE:
+            self._zone_freq_cache.clear()
+        self._zone_freq_cache[zone_id] = frequency
+        return frequency
+    
+    def _lookup_zone_frequency(self, zone_id: int) -> Optional[str]:
+        """Uncached body of get_zone_frequency"""
         # Handle the actual schedule.json structure where zones are direct keys
         zone_key = str(zone_id)
         if zone_key in self.schedule_data:
@@ -829,16 +1301,16 @@ class PlantManager:
                      zone_id=zone_id, available_zones=list(self.schedule_data.keys()))
         
         # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            if zone.get('zone_id') == zone_id:
-                period = zone.get('period')
-                cycles = zone.get('cycles', 1)
-                if period:
-                    # Combine period and cycles to create frequency code (e.g., 'D1', 'W2', 'M3')
-                    frequency = f"{period}{cycles}"
-                    log_event(plants_logger, 'DEBUG', 'Zone frequency found (legacy)', 
-                             zone_id=zone_id, period=period, cycles=cycles, frequency=frequency)
-                    return frequency
+        zone = self._zone_by_id.get(zone_id)
+        if zone is not None:
+            period = zone.get('period')
+            cycles = zone.get('cycles', 1)
+            if period:
+                # Combine period and cycles to create frequency code (e.g., 'D1', 'W2', 'M3')
+                frequency = f"{period}{cycles}"
+                log_event(plants_logger, 'DEBUG', 'Zone frequency found (legacy)', 
+                         zone_id=zone_id, period=period, cycles=cycles, frequency=frequency)
+                return frequency
         
         log_event(plants_logger, 'WARNING', 'Zone frequency not found', zone_id=zone_id)
         return None
@@ -860,77 +1332,33 @@ class PlantManager:
                 return zone_frequency in compatible_frequencies
             return compatible_frequencies == zone_frequency
         
-        # Fallback: search through all plants (less efficient)
-        for plant_info in self.plant_library.values():
-            plant = plant_info['data']
-            if isinstance(plant.get('watering_frequency'), list):
-                if plant_frequency in plant.get('watering_frequency', []):
-                    compatible_frequencies = plant.get('compatible_watering_frequencies', [])
-                    if isinstance(compatible_frequencies, list):
-                        if zone_frequency in compatible_frequencies:
-                            return True
-            elif plant.get('watering_frequency') == plant_frequency:
-                compatible_frequencies = plant.get('compatible_watering_frequencies', [])
-                if isinstance(compatible_frequencies, list):
-                    if zone_frequency in compatible_frequencies:
-                        return True
-        
-        return False
+        # Fallback: any library plant with this frequency that lists zone_frequency as compatible
+        if isinstance(plant_frequency, list):
+            return False
+        self._ensure_plant_library()
+        return zone_frequency in self._freq_compat_index.get(plant_frequency, ())
     
     def _calculate_cycles_per_month(self, frequency: str) -> int:
         """Calculate cycles per month for a frequency code"""
-        if not frequency:
-            return 0
-        
-        code = frequency.upper()
-        if code.startswith('D'):
-            try:
-                cycles_per_day = int(code[1:])
-                return cycles_per_day * 28  # 28 days per month
-            except ValueError:
-                return 0
-        elif code.startswith('W'):
-            try:
-                cycles_per_week = int(code[1:])
-                return cycles_per_week * 4  # 4 weeks per month
-            except ValueError:
-                return 0
-        elif code.startswith('M'):
-            try:
-                cycles_per_month = int(code[1:])
-                return cycles_per_month
-            except ValueError:
-                return 0
-        return 0
+        return _cycles_per_month(frequency)
     
     def has_tertiary_match(self, plant_frequency: str, zone_frequency: str) -> bool:
         """Check for adjacent frequency match (Tertiary compatibility)"""
-        plant_cycles = self._calculate_cycles_per_month(plant_frequency)
-        zone_cycles = self._calculate_cycles_per_month(zone_frequency)
+        # Memoized module-level packing - called once per zone x plant frequency during placement
+        plant_code = _pack_frequency(plant_frequency)
+        zone_code = _pack_frequency(zone_frequency)
         
-        if plant_cycles == 0 or zone_cycles == 0:
+        if not plant_code or not zone_code:
             return False
         
         # Special pairings
-        if (plant_frequency == 'W6' and zone_frequency == 'D1') or (plant_frequency == 'D1' and zone_frequency == 'W6'):
-            return True  # 24 cycles ↔ 28 cycles
-        if (plant_frequency == 'M3' and zone_frequency == 'W1') or (plant_frequency == 'W1' and zone_frequency == 'M3'):
-            return True  # 3 cycles ↔ 4 cycles
-        
-        # Within-category rules
-        plant_code = plant_frequency[0] if plant_frequency else ''
-        zone_code = zone_frequency[0] if zone_frequency else ''
-        
-        if plant_code == zone_code:
-            # Same category - check adjacency
-            if plant_code == 'D':  # Daily codes
-                return abs(plant_cycles - zone_cycles) <= 28
-            elif plant_code == 'W':  # Weekly codes
-                return abs(plant_cycles - zone_cycles) <= 4
-            elif plant_code == 'M':  # Monthly codes
-                return abs(plant_cycles - zone_cycles) <= 1
-        
-        return False
+        if (plant_code, zone_code) in _SPECIAL_PACKED_PAIRS:
+            return True
+        
+        # Within-category adjacency: D, W and M codes are adjacent when their counts differ
+        # by at most one (28, 4 and 1 cycles per month), and codes from different periods
+        # are always more than one apart once packed
+        return abs(plant_code - zone_code) <= 1
     
     def is_frequency_compatible(self, plant_frequency: str, zone_frequency: str, plant_data: Dict[str, Any] = None) -> Tuple[bool, str]:
         """
@@ -939,6 +1367,32 @@ class PlantManager:
         Returns:
             Tuple[bool, str]: (is_compatible, compatibility_level)
         """
+        # The answer only depends on the two codes and the plant's compatible list (or the library fallback)
+        if plant_data:
+            compatible_frequencies = plant_data.get('compatible_watering_frequencies', [])
+            if isinstance(compatible_frequencies, list):
+                compatible_frequencies = tuple(compatible_frequencies)
+        else:
+            compatible_frequencies = _LIBRARY_FALLBACK
+        if isinstance(plant_frequency, list):
+            cache_key = (tuple(plant_frequency), zone_frequency, compatible_frequencies)
+        else:
+            cache_key = (plant_frequency, zone_frequency, compatible_frequencies)
+        try:
+            cached = self._compat_cache.get(cache_key)
+        except TypeError:  # unhashable values - just compute
+            return self._match_frequency(plant_frequency, zone_frequency, plant_data)
+        if cached is not None:
+            return cached
+        
+        result = self._match_frequency(plant_frequency, zone_frequency, plant_data)
+        if len(self._compat_cache) >= COMPAT_CACHE_SIZE:
+            self._compat_cache.clear()
+        self._compat_cache[cache_key] = result
+        return result
+    
+    def _match_frequency(self, plant_frequency: str, zone_frequency: str, plant_data: Dict[str, Any] = None) -> Tuple[bool, str]:
+        """Uncached body of is_frequency_compatible"""
         if self.has_primary_match(plant_frequency, zone_frequency):
             return True, "primary"
         elif self.has_secondary_match(plant_frequency, zone_frequency, plant_data):
@@ -950,37 +1404,46 @@ class PlantManager:
     
     def calculate_zone_compatibility_score(self, plant_data: Dict[str, Any], zone_id: int) -> float:
         """Calculate compatibility score for a plant in a zone (0.0 to 1.0)"""
-        plant_library_data = self.get_plant_data(
+        plant_rec = self.get_plant_rec(
             plant_data.get('plant_id'), 
             plant_data.get('library_book')
         )
-        if not plant_library_data:
+        if not plant_rec:
             return 0.0
         
+        return self._score_zone(plant_data, plant_rec, zone_id)
+    
+    def _score_zone(self, plant_data: Dict[str, Any], plant_rec: PlantRec, zone_id: int) -> float:
+        """calculate_zone_compatibility_score with the plant lookup done once by the caller"""
+        plant_library_data = plant_rec.raw
+        plant_frequencies = plant_rec.freqs
         zone_frequency = self.get_zone_frequency(zone_id)
         if not zone_frequency:
             return 0.0
         
-        # Get plant frequency (handle multiple values)
-        plant_frequencies = plant_library_data.get('watering_frequency', [])
-        if not isinstance(plant_frequencies, list):
-            plant_frequencies = [plant_frequencies]
-        
         # Step 1: Calculate frequency compatibility score
-        frequency_score = 0.0
-        for plant_frequency in plant_frequencies:
-            is_compatible, level = self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)
-            if is_compatible:
-                if level == "primary":
-                    score = 1.0
-                elif level == "secondary":
-                    score = 0.8
-                elif level == "tertiary":
-                    score = 0.6
-                else:
-                    score = 0.0
-                frequency_score = max(frequency_score, score)
-        
+        # A primary match on any plant frequency is the best possible, so check for one before the slower levels
+        if any(self.has_primary_match(plant_frequency, zone_frequency) for plant_frequency in plant_frequencies):
+            frequency_score = 1.0
+        else:
+            frequency_score = 0.0
+            for plant_frequency in plant_frequencies:
+                is_compatible, level = self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)
+                if is_compatible:
+                    if level == "secondary":
+                        score = 0.8
+                    elif level == "tertiary":
+                        score = 0.6
+                    else:
+                        score = 0.0
+                    frequency_score = max(frequency_score, score)
+                    if frequency_score == 0.8:
+                        break  # Nothing left can beat a secondary match
+        
+        return self._apply_emitter_score(plant_data, plant_library_data, zone_id, frequency_score)
+    
+    def _apply_emitter_score(self, plant_data: Dict[str, Any], plant_library_data: Dict[str, Any], zone_id: int, frequency_score: float) -> float:
+        """Steps 2-3 of the zone score: filter and penalize a frequency score by emitter tier"""
         # If frequency is not compatible, return 0
         if frequency_score == 0.0:
             return 0.0
@@ -1059,46 +1522,25 @@ class PlantManager:
         best_score = 0.0
         best_reason = "No compatible zones found"
         
-        # Handle the actual schedule.json structure where zones are direct keys
-        for zone_key, zone in self.schedule_data.items():
-            try:
-                zone_id = int(zone_key)
-            except ValueError:
-                continue  # Skip non-numeric keys
-            
-            # Skip disabled zones
-            if zone.get('mode') == 'disabled':
-                continue
-            
-            score = self.calculate_zone_compatibility_score(plant_data, zone_id)
-            if score > best_score:
-                best_score = score
-                best_zone = zone_id
-                
-                if score == 1.0:
-                    best_reason = "Perfect frequency match"
-                elif score == 0.8:
-                    best_reason = "Compatible frequency match"
-                elif score == 0.6:
-                    best_reason = "Adjacent frequency match"
+        # Look the plant up once rather than once per zone
+        plant_rec = self.get_plant_rec(
+            plant_data.get('plant_id'), 
+            plant_data.get('library_book')
+        )
+        if not plant_rec:
+            return best_zone, best_score, best_reason
         
-        # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            zone_id = zone.get('zone_id')
-            if not zone_id:
-                continue
-            
-            # Skip disabled zones
-            if zone.get('mode') == 'disabled':
-                continue
-            
-            score = self.calculate_zone_compatibility_score(plant_data, zone_id)
+        # Non-disabled zones from schedule.json keys and the legacy zones array
+        self._ensure_schedule()
+        for zone_id in self._active_zone_ids:
+            score = self._score_zone(plant_data, plant_rec, zone_id)
             if score > best_score:
                 best_score = score
                 best_zone = zone_id
                 
                 if score == 1.0:
                     best_reason = "Perfect frequency match"
+                    break  # 1.0 is the highest score possible, and ties keep the first zone anyway
                 elif score == 0.8:
                     best_reason = "Compatible frequency match"
                 elif score == 0.6:
@@ -1106,22 +1548,35 @@ class PlantManager:
         
         return best_zone, best_score, best_reason
     
-    def get_zone_recommendations(self, plant_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Get ranked zone recommendations for a plant"""
+    def batch_score_plant(self, plant_data: Dict[str, Any]) -> List[float]:
+        """
+        Score a plant against every active zone in one call
+        
+        Returns:
+            List[float]: compatibility scores aligned with _active_zone_ids (empty if the plant isn't found)
+        """
+        # Look the plant up once rather than once per zone
+        plant_rec = self.get_plant_rec(
+            plant_data.get('plant_id'), 
+            plant_data.get('library_book')
+        )
+        if not plant_rec:
+            return []
+        
+        # Non-disabled zones from schedule.json keys and the legacy zones array
+        self._ensure_schedule()
+        score_zone = self._score_zone
+        return [score_zone(plant_data, plant_rec, zone_id) for zone_id in self._active_zone_ids]
+    
+    def get_zone_recommendations(self, plant_data: Dict[str, Any], top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get ranked zone recommendations for a plant (only the best top_k when given)"""
         recommendations = []
         
-        # Handle the actual schedule.json structure where zones are direct keys
-        for zone_key, zone in self.schedule_data.items():
-            try:
-                zone_id = int(zone_key)
-            except ValueError:
-                continue  # Skip non-numeric keys
-            
-            # Skip disabled zones
-            if zone.get('mode') == 'disabled':
-                continue
-            
-            score = self.calculate_zone_compatibility_score(plant_data, zone_id)
+        scores = self.batch_score_plant(plant_data)
+        if not scores:
+            return recommendations
+        
+        for (zone_id, zone), score in zip(self._active_zones, scores):
             log_event(plants_logger, 'DEBUG', 'Zone compatibility score calculated', 
                      zone_id=zone_id, 
                      score=score, 
@@ -1137,27 +1592,9 @@ class PlantManager:
                     'mode': zone.get('mode', 'manual')
                 })
         
-        # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            zone_id = zone.get('zone_id')
-            if not zone_id:
-                continue
-            
-            # Skip disabled zones
-            if zone.get('mode') == 'disabled':
-                continue
-            
-            score = self.calculate_zone_compatibility_score(plant_data, zone_id)
-            if score > 0.0:  # Only include compatible zones
-                recommendations.append({
-                    'zone_id': zone_id,
-                    'score': score,
-                    'period': zone.get('period'),
-                    'comment': zone.get('comment', ''),
-                    'mode': zone.get('mode', 'manual')
-                })
-        
-        # Sort by score (highest first)
+        # Sort by score (highest first) - ties keep zone order either way
+        if top_k is not None:
+            return heapq.nlargest(top_k, recommendations, key=lambda x: x['score'])
         recommendations.sort(key=lambda x: x['score'], reverse=True)
         return recommendations
     
@@ -1168,21 +1605,53 @@ class PlantManager:
         Returns:
             Dict with analysis results and recommendations
         """
-        plant_library_data = self.get_plant_data(
+        plant_rec = self.get_plant_rec(
             plant_data.get('plant_id'), 
             plant_data.get('library_book')
         )
-        if not plant_library_data:
+        if not plant_rec:
             return {
                 'error': 'Plant not found in library',
                 'success': False
             }
+        plant_library_data = plant_rec.raw
         
-        # Get zone recommendations
-        recommendations = self.get_zone_recommendations(plant_data)
+        # Score every zone once, collecting recommendations and tracking the
+        # optimal zone in the same pass (same rules as get_zone_recommendations
+        # and find_optimal_zone_for_plant)
+        recommendations = []
+        optimal_zone = None
+        optimal_score = 0.0
+        optimal_reason = "No compatible zones found"
+        self._ensure_schedule()
+        for zone_id, zone in self._active_zones:
+            score = self._score_zone(plant_data, plant_rec, zone_id)
+            log_event(plants_logger, 'DEBUG', 'Zone compatibility score calculated', 
+                     zone_id=zone_id, 
+                     score=score, 
+                     period=zone.get('period'),
+                     mode=zone.get('mode'),
+                     plant_name=plant_data.get('common_name'))
+            if score > optimal_score:
+                optimal_score = score
+                optimal_zone = zone_id
+                if score == 1.0:
+                    optimal_reason = "Perfect frequency match"
+                elif score == 0.8:
+                    optimal_reason = "Compatible frequency match"
+                elif score == 0.6:
+                    optimal_reason = "Adjacent frequency match"
+            if score > 0.0:  # Only include compatible zones
+                recommendations.append({
+                    'zone_id': zone_id,
+                    'score': score,
+                    'period': zone.get('period'),
+                    'comment': zone.get('comment', ''),
+                    'mode': zone.get('mode', 'manual')
+                })
         
-        # Find optimal zone
-        optimal_zone, optimal_score, optimal_reason = self.find_optimal_zone_for_plant(plant_data)
+        # Sort by score (highest first)
+        recommendations.sort(key=lambda x: x['score'], reverse=True)
         
         # Check if there are any compatible zones
         has_compatible_zones = len(recommendations) > 0
@@ -1223,7 +1692,13 @@ class PlantManager:
         # Update optimal zone if it fails emitter sizing
         optimal_emitter_analysis = None
         if optimal_zone:
-            optimal_emitter_analysis = self.calculate_optimal_emitter_size(plant_data, optimal_zone, is_new_placement=True)
+            # The optimal zone scored > 0, so its analysis is already on its recommendation
+            # (filtered out or not) - reuse it rather than calculating again
+            optimal_rec = next((rec for rec in recommendations if rec['zone_id'] == optimal_zone), None)
+            if optimal_rec is not None:
+                optimal_emitter_analysis = optimal_rec['emitter_analysis']
+            else:
+                optimal_emitter_analysis = self.calculate_optimal_emitter_size(plant_data, optimal_zone, is_new_placement=True)
             if optimal_emitter_analysis.get('success') and not optimal_emitter_analysis.get('is_within_tolerance'):
                 # Find new optimal zone from filtered recommendations
                 if enhanced_recommendations:
@@ -1266,15 +1741,16 @@ class PlantManager:
         Returns:
             Dict with validation results
         """
-        plant_library_data = self.get_plant_data(
+        plant_rec = self.get_plant_rec(
             plant_data.get('plant_id'), 
             plant_data.get('library_book')
         )
-        if not plant_library_data:
+        if not plant_rec:
             return {
                 'valid': False,
                 'error': 'Plant not found in library'
             }
+        plant_library_data = plant_rec.raw
         
         zone_frequency = self.get_zone_frequency(zone_id)
         if not zone_frequency:
@@ -1284,13 +1760,17 @@ class PlantManager:
             }
         
         # Get plant frequency
-        plant_frequencies = plant_library_data.get('watering_frequency', [])
-        if not isinstance(plant_frequencies, list):
-            plant_frequencies = [plant_frequencies]
+        plant_frequencies = list(plant_rec.freqs)
         
         compatibility_results = []
+        frequency_score = 0.0
+        best_level = 'none'
         for plant_frequency in plant_frequencies:
             is_compatible, level = self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)
+            # Rank levels by their score (primary > secondary > tertiary), not by name
+            if is_compatible and _LEVEL_SCORES.get(level, 0.0) > frequency_score:
+                frequency_score = _LEVEL_SCORES[level]
+                best_level = level
             compatibility_results.append({
                 'plant_frequency': plant_frequency,
                 'zone_frequency': zone_frequency,
@@ -1299,9 +1779,7 @@ class PlantManager:
             })
         
         # Overall compatibility
-        overall_compatible = any(result['is_compatible'] for result in compatibility_results)
-        best_level = max((result['level'] for result in compatibility_results if result['is_compatible']), 
-                        default='none')
+        overall_compatible = frequency_score > 0.0
         
         # Add emitter sizing validation
         emitter_validation = self.validate_emitter_compatibility(plant_data, zone_id)
@@ -1313,7 +1791,7 @@ class PlantManager:
             'plant_frequencies': plant_frequencies,
             'compatibility_results': compatibility_results,
             'best_compatibility_level': best_level,
-            'score': self.calculate_zone_compatibility_score(plant_data, zone_id),
+            'score': self._apply_emitter_score(plant_data, plant_library_data, zone_id, frequency_score),
             'emitter_validation': emitter_validation
         }
     
@@ -1324,97 +1802,56 @@ class PlantManager:
         Returns:
             Dict with options and suggestions
         """
-        plant_library_data = self.get_plant_data(
+        plant_rec = self.get_plant_rec(
             plant_data.get('plant_id'), 
             plant_data.get('library_book')
         )
-        if not plant_library_data:
+        if not plant_rec:
             return {
                 'error': 'Plant not found in library',
                 'success': False
             }
+        plant_library_data = plant_rec.raw
         
-        # Get all available zones (excluding disabled)
+        # Get all available zones (excluding disabled), sorting them into the three buckets as we go
         available_zones = []
-        
-        # Handle the actual schedule.json structure where zones are direct keys
-        for zone_key, zone in self.schedule_data.items():
-            try:
-                zone_id = int(zone_key)
-            except ValueError:
-                continue  # Skip non-numeric keys
+        frequency_only_zones = []
+        emitter_only_zones = []
+        neither_zones = []
+        plant_frequencies = plant_rec.freqs
+        
+        # Non-disabled zones from schedule.json keys and the legacy zones array
+        self._ensure_schedule()
+        for zone_id, zone in self._active_zones:
+            # Check frequency compatibility (stops at the first compatible plant frequency)
+            zone_frequency = self.get_zone_frequency(zone_id)
+            frequency_compatible = bool(zone_frequency) and any(
+                self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)[0]
+                for plant_frequency in plant_frequencies
+            )
             
-            if zone.get('mode') != 'disabled':
-                # Check both frequency and emitter compatibility
-                frequency_compatible = False
-                emitter_compatible = False
-                
-                # Check frequency compatibility
-                zone_frequency = self.get_zone_frequency(zone_id)
-                if zone_frequency:
-                    plant_frequencies = plant_library_data.get('watering_frequency', [])
-                    if not isinstance(plant_frequencies, list):
-                        plant_frequencies = [plant_frequencies]
-                    
-                    for plant_frequency in plant_frequencies:
-                        is_compatible, _ = self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)
-                        if is_compatible:
-                            frequency_compatible = True
-                            break
-                
-                # Check emitter compatibility
-                emitter_validation = self.validate_emitter_compatibility(plant_data, zone_id)
-                emitter_compatible = emitter_validation['compatible']
-                
-                available_zones.append({
-                    'zone_id': zone_id,
-                    'period': zone.get('period'),
-                    'comment': zone.get('comment', ''),
-                    'mode': zone.get('mode', 'manual'),
-                    'frequency_compatible': frequency_compatible,
-                    'emitter_compatible': emitter_compatible,
-                    'emitter_analysis': emitter_validation.get('emitter_calculation', {})
-                })
-        
-        # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            zone_id = zone.get('zone_id')
-            if zone_id and zone.get('mode') != 'disabled':
-                # Check both frequency and emitter compatibility
-                frequency_compatible = False
-                emitter_compatible = False
-                
-                # Check frequency compatibility
-                zone_frequency = self.get_zone_frequency(zone_id)
-                if zone_frequency:
-                    plant_frequencies = plant_library_data.get('watering_frequency', [])
-                    if not isinstance(plant_frequencies, list):
-                        plant_frequencies = [plant_frequencies]
-                    
-                    for plant_frequency in plant_frequencies:
-                        is_compatible, _ = self.is_frequency_compatible(plant_frequency, zone_frequency, plant_library_data)
-                        if is_compatible:
-                            frequency_compatible = True
-                            break
-                
-                # Check emitter compatibility
-                emitter_validation = self.validate_emitter_compatibility(plant_data, zone_id)
-                emitter_compatible = emitter_validation['compatible']
-                
-                available_zones.append({
-                    'zone_id': zone_id,
-                    'period': zone.get('period'),
-                    'comment': zone.get('comment', ''),
-                    'mode': zone.get('mode', 'manual'),
-                    'frequency_compatible': frequency_compatible,
-                    'emitter_compatible': emitter_compatible,
-                    'emitter_analysis': emitter_validation.get('emitter_calculation', {})
-                })
-        
-        # Determine why no compatible zones found
-        frequency_only_zones = [z for z in available_zones if z['frequency_compatible'] and not z['emitter_compatible']]
-        emitter_only_zones = [z for z in available_zones if not z['frequency_compatible'] and z['emitter_compatible']]
-        neither_zones = [z for z in available_zones if not z['frequency_compatible'] and not z['emitter_compatible']]
+            # Check emitter compatibility (always needed - every zone entry reports it)
+            emitter_validation = self.validate_emitter_compatibility(plant_data, zone_id)
+            emitter_compatible = emitter_validation['compatible']
+            
+            zone_entry = {
+                'zone_id': zone_id,
+                'period': zone.get('period'),
+                'comment': zone.get('comment', ''),
+                'mode': zone.get('mode', 'manual'),
+                'frequency_compatible': frequency_compatible,
+                'emitter_compatible': emitter_compatible,
+                'emitter_analysis': emitter_validation.get('emitter_calculation', {})
+            }
+            available_zones.append(zone_entry)
+            
+            # Determine why no compatible zones found
+            if frequency_compatible and not emitter_compatible:
+                frequency_only_zones.append(zone_entry)
+            elif emitter_compatible and not frequency_compatible:
+                emitter_only_zones.append(zone_entry)
+            elif not frequency_compatible and not emitter_compatible:
+                neither_zones.append(zone_entry)
         
         suggestions = []
         if frequency_only_zones:
@@ -1452,6 +1889,10 @@ class PlantManager:
     
     def _trigger_zone_smart_refresh(self, zone_id: int):
         """Trigger smart duration AND start time refresh for a specific zone ONLY if it's in smart mode"""
+        if self._bulk_depth:
+            # The scheduler reads map.json, so wait until bulk_update() has written it
+            self._pending_refresh_zones[zone_id] = None
+            return
         try:
             # CRITICAL DEBUG: Track PlantManager refresh calls
             print(f"🌱 PLANT MANAGER: Triggering smart refresh for zone {zone_id}")
@@ -1466,7 +1907,10 @@ class PlantManager:
                          zone_id=zone_id, zone_mode=zone_mode)
                 return
             
-            from .scheduler import scheduler
+            # The scheduler reads map.json, so write out a debounced change first
+            self._flush_pending()
+            
+            scheduler = self._get_scheduler()
             
             # 1. Calculate smart duration
             print(f"🌱 PLANT MANAGER: Calling scheduler for zone {zone_id} duration calculation (mock_mode=False)")
@@ -1512,9 +1956,9 @@ class PlantManager:
             return zone.get('mode', 'manual')
         
         # Also check the legacy zones array structure for backward compatibility
-        for zone in self.schedule_data.get('zones', []):
-            if zone.get('zone_id') == zone_id:
-                return zone.get('mode', 'manual')
+        zone = self._zone_by_id.get(zone_id)
+        if zone is not None:
+            return zone.get('mode', 'manual')
         
         return 'manual'  # Default mode
     
@@ -1554,14 +1998,13 @@ class PlantManager:
                 }
             
             # Calculate optimal duration first using scheduler
-            from .scheduler import scheduler
-            duration_result = scheduler.calculate_smart_zone_duration(zone_id, mock_mode=True)
+            duration_result = self._get_scheduler().calculate_smart_zone_duration(zone_id, mock_mode=True)
             if not duration_result.get('success'):
                 return duration_result
             
             # Analyze plant watering requirements to determine optimal schedule
             total_water_requirement = 0
-            plant_frequencies = []
+            frequency_counts = Counter()  # frequency -> number of plants (weighted by quantity)
             
             for plant_instance in zone_plants:
                 plant_id = plant_instance['plant_id']
@@ -1569,14 +2012,14 @@ class PlantManager:
                 quantity = plant_instance.get('quantity', 1)
                 
                 # Get plant library data
-                plant_library_data = self.get_plant_data(plant_id, library_book)
-                if not plant_library_data:
+                plant_rec = self.get_plant_rec(plant_id, library_book)
+                if not plant_rec:
                     continue
                 
                 # Get plant water requirements and frequency
-                water_optimal_in_week = plant_library_data.get('water_optimal_in_week', 0)
-                root_area_sqft = plant_library_data.get('root_area_sqft', 0)
-                frequency = plant_library_data.get('frequency', 'moderate')
+                water_optimal_in_week = plant_rec.water_opt
+                root_area_sqft = plant_rec.root_area
+                frequency = plant_rec.frequency
                 
                 # Calculate total water requirement for this plant type
                 volume_per_plant = water_optimal_in_week * root_area_sqft * 0.623
@@ -1584,7 +2027,8 @@ class PlantManager:
                 total_water_requirement += total_volume_for_type
                 
                 # Track frequency requirements
-                plant_frequencies.extend([frequency] * quantity)
+                if quantity > 0:
+                    frequency_counts[frequency] += quantity
             
             if total_water_requirement <= 0:
                 return {
@@ -1595,17 +2039,15 @@ class PlantManager:
             
             # Determine optimal frequency based on plant requirements
             # Analyze frequency distribution
-            frequency_counts = {}
-            for freq in plant_frequencies:
-                frequency_counts[freq] = frequency_counts.get(freq, 0) + 1
+            majority = sum(frequency_counts.values()) * 0.5
             
             # Determine optimal period and cycles
             # This is a simplified algorithm - can be enhanced based on specific requirements
-            if 'high' in frequency_counts and frequency_counts['high'] > len(plant_frequencies) * 0.5:
+            if frequency_counts['high'] > majority:
                 # Majority need high frequency - daily watering
                 calculated_period = 'D'
                 calculated_cycles = 1  # Once per day
-            elif 'moderate' in frequency_counts and frequency_counts['moderate'] > len(plant_frequencies) * 0.5:
+            elif frequency_counts['moderate'] > majority:
                 # Majority need moderate frequency - every few days
                 calculated_period = 'D'
                 calculated_cycles = 2  # Twice per week
@@ -1660,6 +2102,8 @@ class PlantManager:
 
 # Create global instance
 plant_manager = PlantManager()
+# Debounce timers are daemon threads - write out anything still pending on interpreter exit
+atexit.register(plant_manager._flush_pending)
 
 @plant_bp.route('/api/smart/validate-compatibility', methods=['POST'])
 def validate_plant_zone_compatibility():
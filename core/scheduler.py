@@ -21,7 +21,7 @@ from astral import LocationInfo
 import re
 
 # Import GPIO functions directly - scheduler is now primary controller
-from .gpio import setup_gpio, activate_zone, deactivate_zone, cleanup_gpio, get_zone_state, ZONE_PINS
+from .gpio import setup_gpio, activate_zone, deactivate_zone, deactivate_zones, cleanup_gpio, get_zone_state, ZONE_PINS
 
 # Import unified logging system
 from .logging import log_event, setup_logger
@@ -495,19 +495,21 @@ class WateringScheduler:
             
             success_count = 0
             with self.lock:
-                for zone_id in ZONE_PINS.keys():
-                    if self.zone_states.get(zone_id, {}).get('active', False):
-                        print(f"DEBUG: Shutdown stop preserving active_zones for zone {zone_id}")
-                        # Only deactivate hardware, preserve active_zones
-                        deactivate_zone(zone_id)
-                        # Update zone state but keep end_time for restoration
-                        self.zone_states[zone_id] = {
-                            'active': False,
-                            'end_time': self.zone_states[zone_id]['end_time'],  # Keep for restoration
-                            'type': self.zone_states[zone_id]['type'],
-                            'remaining': 0
-                        }
-                        success_count += 1
+                stopped_zones = [zone_id for zone_id in ZONE_PINS.keys()
+                                 if self.zone_states.get(zone_id, {}).get('active', False)]
+                # Only deactivate hardware, preserve active_zones - one write for every zone
+                if stopped_zones:
+                    deactivate_zones(stopped_zones)
+                for zone_id in stopped_zones:
+                    print(f"DEBUG: Shutdown stop preserving active_zones for zone {zone_id}")
+                    # Update zone state but keep end_time for restoration
+                    self.zone_states[zone_id] = {
+                        'active': False,
+                        'end_time': self.zone_states[zone_id]['end_time'],  # Keep for restoration
+                        'type': self.zone_states[zone_id]['type'],
+                        'remaining': 0
+                    }
+                    success_count += 1
             
             print(f"DEBUG: active_zones after shutdown stop: {self.active_zones}")
             
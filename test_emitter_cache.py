@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Check that cached emitter sizing is dropped when the schedule is reloaded.
+
+The scheduler refreshes the plant manager with _load_schedule() (not reload_data()),
+so a zone mode or duration change there must not leave stale calculate_optimal_emitter_size results.
+Works on a temporary copy of data/schedule.json - the real file is never modified.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import core.plant_manager as pm_module
+
+def _write_schedule(path, schedule):
+    with open(path, 'w') as f:
+        json.dump(schedule, f, indent=2)
+
+def _set_duration(zone, duration):
+    if isinstance(zone.get('times'), list) and zone['times']:
+        for time_entry in zone['times']:
+            time_entry['duration'] = duration
+    else:
+        zone.setdefault('time', {})['duration'] = duration
+
+def test_emitter_cache_follows_schedule():
+    work_dir = tempfile.mkdtemp()
+    schedule_path = os.path.join(work_dir, 'schedule.json')
+    shutil.copy(pm_module.SCHEDULE_JSON_PATH, schedule_path)
+    original_path = pm_module.SCHEDULE_JSON_PATH
+    pm_module.SCHEDULE_JSON_PATH = schedule_path
+    try:
+        pm = pm_module.PlantManager()
+        with open(schedule_path) as f:
+            schedule = json.load(f)
+
+        # A smart zone that already has plants - its sizing uses the zone duration
+        zone_id = next((int(k) for k, zone in schedule.items()
+                        if k.isdigit() and zone.get('mode') == 'smart' and pm.zone_has_plants(int(k))), None)
+        assert zone_id is not None, "No smart zone with plants in data/ to test with"
+        plant_instance = pm.get_zone_plants(zone_id)[0]
+        plant_data = {'plant_id': plant_instance['plant_id'], 'library_book': plant_instance['library_book']}
+
+        before = pm.calculate_optimal_emitter_size(plant_data, zone_id, is_new_placement=True)
+        assert before.get('success'), f"Emitter calculation failed: {before}"
+        print(f"✅ Zone {zone_id} smart sizing: {before.get('recommended_emitter')} GPH, tier {before.get('emitter_tier')}")
+
+        # Duration change -> different actual weekly water for the same emitter
+        _set_duration(schedule[str(zone_id)], '02:30:00')
+        _write_schedule(schedule_path, schedule)
+        pm._load_schedule()
+        after_duration = pm.calculate_optimal_emitter_size(plant_data, zone_id, is_new_placement=True)
+        assert after_duration is not before, "Cached result survived _load_schedule()"
+        assert after_duration.get('actual_weekly_water') != before.get('actual_weekly_water'), \
+            f"Duration change not reflected: {after_duration}"
+        print(f"✅ Duration change picked up: {before.get('actual_weekly_water')} -> {after_duration.get('actual_weekly_water')}")
+
+        # Mode change -> manual mode result
+        schedule[str(zone_id)]['mode'] = 'manual'
+        _write_schedule(schedule_path, schedule)
+        pm._load_schedule()
+        after_mode = pm.calculate_optimal_emitter_size(plant_data, zone_id, is_new_placement=True)
+        assert after_mode.get('health_status') == 'manual_mode', f"Mode change not reflected: {after_mode}"
+        print("✅ Mode change picked up: manual_mode")
+    finally:
+        pm_module.SCHEDULE_JSON_PATH = original_path
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    try:
+        test_emitter_cache_follows_schedule()
+        print("✅ Emitter cache follows schedule reloads")
+    except AssertionError as e:
+        print(f"❌ {e}")
+        sys.exit(1)